@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
 import requests
 import re
+import os
 import json
 import time
-from bs4 import BeautifulSoup
+import html
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+from session_pool import SessionPool
+
+# lxml builds the tree several times faster than the pure-Python parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+INPUT_TAG_RE = re.compile(r'<input\b[^>]*>', re.IGNORECASE)
+ATTRIBUTE_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
 
 class UniversalLoginSystem:
-    def __init__(self):
+    def __init__(self, session_pool=None, layout_cache_file='login_layouts.json'):
         self.session = requests.Session()
+        self.session_pool = session_pool if session_pool is not None else SessionPool()
+        self.layout_cache_file = layout_cache_file
+        self.form_layouts = self._load_form_layouts()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -41,7 +58,8 @@ class UniversalLoginSystem:
     
     def detect_login_form(self, html_content):
         """Detect login form fields automatically"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Only <form> subtrees are built, the rest of the page is skipped
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=SoupStrainer('form'))
         
         login_info = {
             'username_field': 'username',
@@ -51,43 +69,108 @@ class UniversalLoginSystem:
             'form_data': {}
         }
         
-        # Find all forms
+        # Every form is inspected: the keyword check on the action always
+        # matched because it included '', so no need to serialise the form
         forms = soup.find_all('form')
         for form in forms:
-            form_action = form.get('action', '')
+            login_info['form_action'] = form.get('action', '')
             
-            # Check if this is likely a login form
-            if any(keyword in form_action.lower() for keyword in ['login', 'signin', 'auth', '']) or \
-               any(keyword in str(form).lower() for keyword in ['username', 'password', 'login']):
+            # Extract input fields
+            inputs = form.find_all('input')
+            for input_field in inputs:
+                input_name = input_field.get('name', '')
+                input_type = input_field.get('type', '').lower()
+                input_value = input_field.get('value', '')
                 
-                login_info['form_action'] = form_action
-                
-                # Extract input fields
-                inputs = form.find_all('input')
-                for input_field in inputs:
-                    input_name = input_field.get('name', '')
-                    input_type = input_field.get('type', '').lower()
-                    input_value = input_field.get('value', '')
-                    
-                    if input_type == 'text' and any(keyword in input_name.lower() for keyword in ['user', 'email', 'login']):
-                        login_info['username_field'] = input_name
-                    elif input_type == 'password':
-                        login_info['password_field'] = input_name
-                    elif any(keyword in input_name.lower() for keyword in ['captcha', 'capt', 'code']):
-                        login_info['captcha_field'] = input_name
-                    elif input_name and input_value and input_type not in ['submit', 'button']:
-                        login_info['form_data'][input_name] = input_value
+                if input_type == 'text' and any(keyword in input_name.lower() for keyword in ['user', 'email', 'login']):
+                    login_info['username_field'] = input_name
+                elif input_type == 'password':
+                    login_info['password_field'] = input_name
+                elif any(keyword in input_name.lower() for keyword in ['captcha', 'capt', 'code']):
+                    login_info['captcha_field'] = input_name
+                elif input_name and input_value and input_type not in ['submit', 'button']:
+                    login_info['form_data'][input_name] = input_value
+        
+        return login_info
+    
+    def extract_input_values(self, html_content):
+        """Scan <input> tags without building a tree, returning name -> value"""
+        values = {}
+        for tag in INPUT_TAG_RE.findall(html_content):
+            attributes = {}
+            for match in ATTRIBUTE_RE.finditer(tag[6:]):
+                value = next((v for v in match.groups()[1:] if v is not None), '')
+                attributes[match.group(1).lower()] = html.unescape(value)
+            if attributes.get('name'):
+                values[attributes['name']] = attributes.get('value', '')
+        return values
+    
+    def get_login_form(self, login_url, html_content):
+        """Return the login form, reusing the cached layout for this URL
+        
+        With a cached layout only the dynamic field values (CSRF tokens,
+        nonces) are re-read from the page. A full detection runs again when
+        the page no longer contains the cached fields.
+        """
+        layout = self.form_layouts.get(login_url)
+        if layout:
+            values = self.extract_input_values(html_content)
+            # The regex scan can miss a field BeautifulSoup found; detect again rather than guess
+            expected = set(layout['required_fields']) | set(layout['form_fields'])
+            if all(name in values for name in expected):
+                return {
+                    'username_field': layout['username_field'],
+                    'password_field': layout['password_field'],
+                    'captcha_field': layout['captcha_field'],
+                    'form_action': layout['form_action'],
+                    'form_data': {name: values.get(name) for name in layout['form_fields'] if values.get(name)}
+                }
+            print("♻️ Login form layout changed, detecting again...")
+        
+        login_info = self.detect_login_form(html_content)
+        
+        values = self.extract_input_values(html_content)
+        required = [name for name in values if name in login_info['form_data'] or name in (
+            login_info['username_field'], login_info['password_field'], login_info['captcha_field'])]
+        
+        self.form_layouts[login_url] = {
+            'username_field': login_info['username_field'],
+            'password_field': login_info['password_field'],
+            'captcha_field': login_info['captcha_field'],
+            'form_action': login_info['form_action'],
+            'form_fields': list(login_info['form_data']),
+            'required_fields': required
+        }
+        self._save_form_layouts()
         
         return login_info
     
+    def _load_form_layouts(self):
+        try:
+            with open(self.layout_cache_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_form_layouts(self):
+        try:
+            tmp_file = self.layout_cache_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(self.form_layouts, f, indent=2)
+            os.replace(tmp_file, self.layout_cache_file)
+        except Exception as e:
+            print(f"Error saving login form layouts: {e}")
+    
+    def resolve_login_url(self, login_url, base_url=None):
+        """Absolute login URL, joining a relative one onto base_url"""
+        if base_url and not login_url.startswith('http'):
+            return urljoin(base_url, login_url)
+        return login_url
+    
     def perform_login(self, login_url, username, password, base_url=None):
         """Perform complete login process"""
         try:
-            # Build complete URL
-            if base_url and not login_url.startswith('http'):
-                full_login_url = urljoin(base_url, login_url)
-            else:
-                full_login_url = login_url
+            full_login_url = self.resolve_login_url(login_url, base_url)
             
             print(f"🔍 Accessing login page: {full_login_url}")
             
@@ -97,7 +180,7 @@ class UniversalLoginSystem:
                 return {'success': False, 'error': f'Cannot access login page: {response.status_code}'}
             
             # Detect login form
-            login_info = self.detect_login_form(response.text)
+            login_info = self.get_login_form(full_login_url, response.text)
             print(f"📝 Detected form fields: {login_info}")
             
             # Solve captcha if present
@@ -156,6 +239,40 @@ class UniversalLoginSystem:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def get_session(self, login_url, username, password, base_url=None, force=False):
+        """Reuse a live pooled session, logging in only when there is none"""
+        # The same relative path on two sites is two different logins
+        pool_url = self.resolve_login_url(login_url, base_url)
+        if not force:
+            entry = self.session_pool.get(pool_url, username)
+            if entry:
+                self.session_pool.restore(entry, self.session)
+                self.cookies = dict(entry['cookies'])
+                self.logged_in = True
+                
+                remaining = int(entry['expires_at'] - time.time())
+                print(f"♻️ Reusing pooled session (expires in {remaining}s)")
+                
+                return {
+                    'success': True,
+                    'cookies': self.cookies,
+                    'message': 'Reused pooled session',
+                    'reused': True
+                }
+        
+        login_result = self.perform_login(login_url, username, password, base_url)
+        if login_result['success']:
+            self.session_pool.put(pool_url, username, cookie_jar=self.session.cookies, cookies=self.cookies)
+        
+        return login_result
+    
+    def relogin(self, login_url, username, password, base_url=None):
+        """Discard the pooled session after a 401/403 and log in again"""
+        print("🔁 Session rejected, logging in again...")
+        self.session_pool.invalidate(self.resolve_login_url(login_url, base_url), username)
+        self.session.cookies.clear()
+        return self.get_session(login_url, username, password, base_url, force=True)
+    
     def _check_login_success(self, response):
         """Check if login was successful"""
         # Check for redirect to dashboard/client area
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 import requests
-import json
 import time
 from datetime import datetime
+from export_pipeline import render_tester_script
+from circuit_breaker import HostCircuitBreakers, OPEN
+from retry_policy import RetryPolicy
+from rate_limit import HostRateLimiter
+from deadline import Deadline, DEADLINE_REASON
 
 class APITester:
-    def __init__(self):
+    def __init__(self, breakers=None, retry_policy=None, rate_limiter=None, deadline=None):
         self.session = requests.Session()
         self.results = []
         self.working_apis = []
+        self.breakers = breakers if breakers is not None else HostCircuitBreakers()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else HostRateLimiter()
+        self.deadline = deadline if deadline is not None else Deadline()
         
     def test_api_endpoint(self, api_info, auth_cookies=None):
         """Test a single API endpoint"""
@@ -18,25 +26,36 @@ class APITester:
             headers = api_info.get('headers', {})
             cookies = auth_cookies or api_info.get('cookies', {})
             
+            # Not worth starting what cannot finish before the run's deadline
+            if self.deadline.timeout(self.rate_limiter.delay(url)) is None:
+                return self.record_skipped(api_info, DEADLINE_REASON)
+            
+            # Fail fast instead of waiting out the timeout on a host that is down
+            breaker = self.breakers.get(url)
+            if not breaker.allow():
+                return self.record_skipped(api_info, f"circuit open: {breaker.last_error}")
+            
             print(f"🔧 Testing {method} {url}")
             
             # Prepare request
             request_kwargs = {
                 'url': url,
                 'headers': headers,
-                'cookies': cookies,
-                'timeout': 15
+                'cookies': cookies
             }
             
             # Add data based on method
-            if method in ['POST', 'PUT'] and 'params' in api_info:
+            if method in ['POST', 'PUT', 'PATCH'] and 'params' in api_info:
                 request_kwargs['data'] = api_info['params']
+            elif method in ['POST', 'PUT', 'PATCH'] and api_info.get('json_body') is not None:
+                request_kwargs['json'] = api_info['json_body']
+            elif method not in ['GET', 'HEAD'] and api_info.get('data') is not None:
+                # Raw bodies captured from HAR (XML, text, ...) go out as they were
+                request_kwargs['data'] = api_info['data']
             elif method == 'GET' and 'params' in api_info:
                 request_kwargs['params'] = api_info['params']
             
-            start_time = time.time()
-            response = self.session.request(method, **request_kwargs)
-            response_time = time.time() - start_time
+            response, response_time, attempts = self._send(method, request_kwargs, breaker)
             
             # Create result
             result = {
@@ -44,6 +63,7 @@ class APITester:
                 'method': method,
                 'status_code': response.status_code,
                 'response_time': response_time,
+                'attempts': attempts,
                 'success': response.status_code == 200,
                 'timestamp': datetime.now().isoformat(),
                 'request_headers': headers,
@@ -74,6 +94,10 @@ class APITester:
             return result
             
         except Exception as e:
+            # Connection errors were already counted against the breaker per attempt
+            if not isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                self.breakers.get(api_info['url']).record_success()
+            
             error_result = {
                 'url': api_info['url'],
                 'method': api_info.get('method', 'GET'),
@@ -81,91 +105,131 @@ class APITester:
                 'response_time': 0,
                 'success': False,
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'attempts': getattr(e, 'attempts', 1),
+                'timestamp': datetime.now().isoformat(),
+                'api_info': api_info
             }
             self.results.append(error_result)
             print(f"💥 ERROR: {e}")
             return error_result
     
-    def generate_python_code(self, api_result):
-        """Generate Python code for working API"""
-        api_info = api_result['api_info']
-        
-        code = f"""#!/usr/bin/env python3
-import requests
-import json
-
-# API Configuration
-url = "{api_info['url']}"
-method = "{api_info.get('method', 'GET')}"
-
-headers = {json.dumps(api_info.get('headers', {}), indent=4, ensure_ascii=False)}
-
-cookies = {json.dumps(api_info.get('cookies', {}), indent=4, ensure_ascii=False)}
-"""
-
-        # Add request data
-        if api_info.get('method') in ['POST', 'PUT'] and api_info.get('params'):
-            code += f"""
-data = {json.dumps(api_info['params'], indent=4, ensure_ascii=False)}
-"""
-        elif api_info.get('method') == 'GET' and api_info.get('params'):
-            code += f"""
-params = {json.dumps(api_info['params'], indent=4, ensure_ascii=False)}
-"""
-
-        code += """
-# Create session and make request
-session = requests.Session()
-
-try:
-    if method == 'GET':
-        response = session.get(url, headers=headers, cookies=cookies"""
+    def _send(self, method, request_kwargs, breaker):
+        """Send a request, retrying transient failures as retry_policy allows
         
-        if api_info.get('method') == 'GET' and api_info.get('params'):
-            code += ", params=params"
+        Returns (response, response_time of the last attempt, attempts). The
+        final connection error is re-raised with an attempts attribute. Each
+        attempt's timeout comes from the deadline, and no retry is made that
+        could not finish before it.
+        """
+        self.retry_policy.budget.record_request()
+        attempt = 0
         
-        code += """)
-    elif method == 'POST':
-        response = session.post(url, headers=headers, cookies=cookies"""
+        while True:
+            self.rate_limiter.acquire(request_kwargs['url'])
+            request_kwargs['timeout'] = self.deadline.timeout() or self.deadline.min_timeout
+            start_time = time.time()
+            try:
+                response = self.session.request(method, **request_kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure(str(e))
+                delay = self.retry_policy.backoff(attempt)
+                # No point retrying into a breaker that just opened
+                if (breaker.state == OPEN or not self._retry_fits(request_kwargs['url'], delay)
+                        or not self.retry_policy.should_retry(method, attempt, error=e)):
+                    e.attempts = attempt + 1
+                    raise
+                reason = type(e).__name__
+            else:
+                response_time = time.time() - start_time
+                breaker.record_success()
+                self.rate_limiter.update(request_kwargs['url'], response)
+                delay = self.retry_policy.backoff(attempt)
+                if (not self._retry_fits(request_kwargs['url'], delay)
+                        or not self.retry_policy.should_retry(method, attempt, response=response)):
+                    return response, response_time, attempt + 1
+                reason = f"status {response.status_code}"
+            
+            print(f"🔁 Retrying {method} after {reason} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+    
+    def _retry_fits(self, url, delay):
+        """Whether another attempt after delay could still finish before the deadline"""
+        return self.deadline.timeout(delay + self.rate_limiter.delay(url)) is not None
+    
+    def record_skipped(self, api_info, reason):
+        """Record an endpoint that was deliberately not sent"""
+        result = {
+            'url': api_info['url'],
+            'method': api_info.get('method', 'GET').upper(),
+            'status_code': 0,
+            'response_time': 0,
+            'success': False,
+            'skipped': True,
+            'error': reason,
+            'timestamp': datetime.now().isoformat(),
+            'api_info': api_info
+        }
+        self.results.append(result)
+        print(f"⏭️ SKIPPED {result['method']} {result['url']}: {reason}")
+        return result
+    
+    def restore_result(self, result, api_info=None):
+        """Re-attach a result recorded by an earlier, interrupted run
         
-        if api_info.get('method') in ['POST', 'PUT'] and api_info.get('params'):
-            code += ", data=data"
+        The journal holds redacted credentials, so api_info from the current
+        capture replaces the stored one when given.
+        """
+        if api_info is not None:
+            result['api_info'] = api_info
+        result['resumed'] = True
+        self.results.append(result)
+        if result['success']:
+            self.working_apis.append(result)
+        return result
+    
+    def discard_result(self, result):
+        """Forget a result that is about to be retried"""
+        if result in self.results:
+            self.results.remove(result)
+        if result in self.working_apis:
+            self.working_apis.remove(result)
+    
+    def record_duplicate(self, result, api_info):
+        """Fan a tested result out to a duplicate request without re-testing it"""
+        duplicate = dict(result)
+        duplicate['url'] = api_info['url']
+        duplicate['api_info'] = api_info
+        duplicate['duplicate_of'] = api_info.get('fingerprint')
+        duplicate['deduplicated'] = True
         
-        code += """)
-    elif method == 'PUT':
-        response = session.put(url, headers=headers, cookies=cookies"""
+        self.results.append(duplicate)
+        return duplicate
+    
+    def get_load_profile(self):
+        """Working APIs with how often each was called in the capture
         
-        if api_info.get('method') in ['POST', 'PUT'] and api_info.get('params'):
-            code += ", data=data"
+        Duplicates collapsed by deduplication count towards the weight of
+        the request they were folded into.
+        """
+        calls = {}
+        for result in self.results:
+            if result.get('deduplicated'):
+                calls[result['duplicate_of']] = calls.get(result['duplicate_of'], 0) + 1
         
-        code += """)
-    else:
-        response = session.request(method, url, headers=headers, cookies=cookies)
-
-    print(f"Status Code: {response.status_code}")
-    print(f"URL: {url}")
+        profile = []
+        for api_result in self.working_apis:
+            fingerprint = api_result['api_info'].get('fingerprint')
+            profile.append({
+                'api_info': api_result['api_info'],
+                'weight': 1 + calls.get(fingerprint, 0),
+                'response_time': api_result['response_time']
+            })
+        return profile
     
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            print("✅ SUCCESS - Response JSON:")
-            print(json.dumps(data, indent=2, ensure_ascii=False))
-        except:
-            print("✅ SUCCESS - Response Text:")
-            print(response.text)
-    else:
-        print(f"❌ FAILED - Status: {response.status_code}")
-        print("Response:", response.text)
-
-except Exception as e:
-    print(f"💥 Request failed: {e}")
-
-print("\\n" + "="*50)
-print("API Test Completed!")
-"""
-
-        return code
+    def generate_python_code(self, api_result):
+        """Generate Python code for working API"""
+        return render_tester_script(api_result['api_info'])
     
     def export_all_codes(self):
         """Export all working APIs as code files"""
@@ -189,12 +253,25 @@ print("API Test Completed!")
     def get_stats(self):
         """Get testing statistics"""
         total = len(self.results)
-        successful = len(self.working_apis)
-        failed = total - successful
+        successful = len([r for r in self.results if r['success']])
+        skipped = len([r for r in self.results if r.get('skipped')])
+        # Untested endpoints are reported as skipped, not as failures
+        failed = total - successful - skipped
+        duplicates = len([r for r in self.results if r.get('deduplicated')])
+        retries = sum(r.get('attempts', 1) - 1 for r in self.results if not r.get('deduplicated'))
         
         return {
             'total_tested': total,
             'successful': successful,
             'failed': failed,
-            'success_rate': (successful / total * 100) if total > 0 else 0
+            'success_rate': (successful / total * 100) if total > 0 else 0,
+            'unique_tested': total - duplicates,
+            'duplicates': duplicates,
+            'dedup_ratio': (duplicates / total * 100) if total > 0 else 0,
+            'skipped': skipped,
+            'deadline_skipped': len([r for r in self.results if r.get('error') == DEADLINE_REASON]),
+            'retries': retries,
+            'retry_budget': self.retry_policy.budget.snapshot(),
+            'circuit_breakers': self.breakers.summary(),
+            'rate_limits': self.rate_limiter.summary()
         }
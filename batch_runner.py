@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from api_tester import APITester
+from devtools_parser import AdvancedDevToolsParser
+from load_bench import percentile
+from checkpoint import RunCheckpoint
+from circuit_breaker import HostCircuitBreakers
+from concurrency_limit import HostConcurrency
+from host_scheduler import HostScheduler
+from retry_policy import RetryPolicy, RetryBudget
+from run_history import LatencyHistory, CRITICAL_TAG
+from deadline import Deadline, DEADLINE_REASON
+
+# Columns written for every result; the response body only on request
+RESULT_FIELDS = [
+    'url', 'method', 'status_code', 'success', 'response_time', 'error',
+    'timestamp', 'fingerprint', 'deduplicated', 'duplicate_of', 'skipped'
+]
+
+# Exit codes for pipelines
+EXIT_OK = 0
+EXIT_THRESHOLD = 1
+EXIT_INPUT = 2
+EXIT_INTERRUPTED = 130
+
+class ResultWriter:
+    def __init__(self, stream, output_format='jsonl', include_response=False):
+        self.stream = stream
+        self.output_format = output_format
+        self.include_response = include_response
+        self.fields = RESULT_FIELDS + (['response'] if include_response else [])
+        self.csv_writer = None
+        
+        if output_format == 'csv':
+            self.csv_writer = csv.DictWriter(stream, fieldnames=self.fields, extrasaction='ignore')
+            self.csv_writer.writeheader()
+        elif output_format != 'jsonl':
+            raise ValueError(f"Unsupported output format: {output_format}")
+    
+    def record(self, result):
+        """Flatten a tester result to the exported columns"""
+        record = {field: result.get(field) for field in self.fields}
+        record['fingerprint'] = result.get('api_info', {}).get('fingerprint')
+        return record
+    
+    def write(self, result):
+        record = self.record(result)
+        if self.csv_writer:
+            if self.include_response and not isinstance(record['response'], str):
+                record['response'] = json.dumps(record['response'], ensure_ascii=False)
+            self.csv_writer.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.stream.flush()
+
+class BatchRunner:
+    def __init__(self, tester=None, concurrency=16, progress_interval=1.0, progress_stream=None, adaptive=True,
+                 history=None):
+        self.tester = tester or APITester()
+        self.history = history or LatencyHistory()
+        self.parser = AdvancedDevToolsParser()
+        self.concurrency = concurrency
+        # Per-host AIMD limits under the overall worker count
+        self.host_concurrency = HostConcurrency(min(4, concurrency), max_limit=concurrency) if adaptive else None
+        self.progress_interval = progress_interval
+        self.progress_stream = progress_stream or sys.stderr
+        
+        # requests keeps 10 connections per host by default; match the worker count
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.tester.session.mount('http://', adapter)
+        self.tester.session.mount('https://', adapter)
+    
+    def emit(self, event, **fields):
+        """Write one machine-readable progress event as a JSON line"""
+        self.progress_stream.write(json.dumps({'event': event, **fields}, default=str) + '\n')
+        self.progress_stream.flush()
+    
+    def filter_requests(self, requests, methods=None, hosts=None, pattern=None, include_resources=False):
+        """Drop requests the run should not touch"""
+        methods = {m.upper() for m in methods} if methods else None
+        hosts = {h.lower() for h in hosts} if hosts else None
+        pattern = re.compile(pattern) if pattern else None
+        
+        selected = []
+        for req in requests:
+            if not include_resources and req.get('api_type') == 'resource':
+                continue
+            if methods and req['method'] not in methods:
+                continue
+            if hosts and urlparse(req['url']).hostname not in hosts:
+                continue
+            if pattern and not pattern.search(req['url']):
+                continue
+            selected.append(req)
+        return selected
+    
+    def run(self, apis, writer, auth_cookies=None, checkpoint=None, resume=False, relogin=None):
+        """Test apis concurrently, streaming each result to writer as it completes
+        
+        Requests wait in per-host queues and go to the pool only as workers
+        free up, and only for hosts the rate limiter is not holding back, so
+        a throttled host never ties up workers the others could use. Hosts
+        are served by deficit round-robin on their average latency, so slow
+        endpoints cannot block the fast hosts behind them. When adaptive,
+        each host also gets its own AIMD concurrency limit tuned from latency
+        and errors. Critical requests go first, the rest longest expected
+        first from latency history. Once the tester's deadline leaves no room
+        for another request, whatever is still queued is recorded as skipped.
+        relogin is called once when an endpoint answers 401/403, to replace an
+        expired pooled session; requests sent with the old session go again.
+        With a checkpoint every finished request is journaled;
+        resume replays the journal into the tester and writer and only tests
+        what is left. Returns the run summary.
+        """
+        start_time = time.time()
+        unique_apis, groups = self.parser.deduplicate_requests(apis)
+        total = len(apis)
+        done = 0
+        successful = 0
+        skipped = 0
+        deadline = self.tester.deadline
+        latencies = []
+        last_progress = 0
+        
+        def finish(api, result):
+            nonlocal done, successful, skipped
+            if result['status_code']:
+                latencies.append(result['response_time'])
+            
+            # Same fingerprint means same answer - reuse it for every duplicate
+            outcomes = [result] + [self.tester.record_duplicate(result, duplicate)
+                                   for duplicate in groups[api['fingerprint']][1:]]
+            for outcome in outcomes:
+                writer.write(outcome)
+            done += len(outcomes)
+            successful += len(outcomes) if result['success'] else 0
+            skipped += len(outcomes) if result.get('skipped') else 0
+        
+        to_test = unique_apis
+        if checkpoint:
+            run_id = checkpoint.make_run_id(groups)
+            if resume:
+                checkpoint.load(run_id)
+            checkpoint.open(run_id, resume)
+            
+            to_test = []
+            for api in unique_apis:
+                stored = checkpoint.completed.get(api['fingerprint'])
+                if stored is None:
+                    to_test.append(api)
+                else:
+                    finish(api, self.tester.restore_result(stored, api))
+        resumed = len(unique_apis) - len(to_test)
+        to_test, schedule = self.history.plan(to_test, self.concurrency)
+        
+        self.emit('start', total=total, unique=len(unique_apis), resumed=resumed, concurrency=self.concurrency,
+                  predicted=schedule['predicted'])
+        
+        scheduler = HostScheduler(self.tester.rate_limiter, self.host_concurrency)
+        for api in to_test:
+            scheduler.push(api)
+        
+        completed = False
+        interrupted = False
+        pending = {}
+        # Bumped by a re-login, to tell which requests went out with the old session
+        session_number = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                while not interrupted:
+                    if scheduler and deadline.timeout() is None:
+                        # Nothing more can finish in time: the rest of the queue stays untested
+                        for api in scheduler.drain():
+                            finish(api, self.tester.record_skipped(api, DEADLINE_REASON))
+                    
+                    while len(pending) < self.concurrency:
+                        api = scheduler.pop_ready()
+                        if api is None:
+                            break
+                        limit = self.host_concurrency.get(api['url']) if self.host_concurrency else None
+                        started = limit.acquire() if limit else None
+                        future = pool.submit(self.tester.test_api_endpoint, api, auth_cookies)
+                        pending[future] = (api, limit, started, session_number)
+                    
+                    if not pending and not scheduler:
+                        break
+                    
+                    # With a free worker, wake up when a throttled host may be served again
+                    timeout = None
+                    if scheduler and len(pending) < self.concurrency:
+                        ready_in = scheduler.next_ready_in()
+                        timeout = max(ready_in, 0.01) if ready_in is not None else None
+                    # Also wake up when the deadline closes, to stop waiting on throttled hosts
+                    if scheduler and deadline.closing_in() is not None:
+                        closing_in = max(deadline.closing_in(), 0.01)
+                        timeout = closing_in if timeout is None else min(timeout, closing_in)
+                    
+                    try:
+                        if pending:
+                            finished, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                        else:
+                            time.sleep(timeout or 0.01)
+                            finished = []
+                    except KeyboardInterrupt:
+                        # Drop queued requests, but journal the ones already on the wire
+                        interrupted = True
+                        finished = [future for future in pending if not future.cancel()]
+                        wait(finished)
+                    
+                    for future in finished:
+                        api, limit, started, sent_with = pending.pop(future)
+                        result = future.result()
+                        if limit:
+                            limit.release(started, result)
+                        if not result.get('skipped'):
+                            scheduler.record(api['url'], result['response_time'])
+                        
+                        if result['status_code'] in (401, 403) and not interrupted:
+                            if relogin and sent_with == session_number:
+                                self.emit('relogin', url=api['url'], status_code=result['status_code'])
+                                login_result = relogin()
+                                relogin = None
+                                if login_result['success']:
+                                    auth_cookies = login_result['cookies']
+                                    session_number += 1
+                                else:
+                                    self.emit('error', error=f"Re-login failed: {login_result.get('error', 'Unknown error')}")
+                            if sent_with != session_number:
+                                # Rejected with a session that has since been replaced
+                                self.tester.discard_result(result)
+                                scheduler.push(api)
+                                continue
+                        # Skipped endpoints are retried when the run is resumed
+                        if checkpoint and not result.get('skipped'):
+                            checkpoint.record(api['fingerprint'], result)
+                        finish(api, result)
+                    
+                    if time.time() - last_progress >= self.progress_interval:
+                        last_progress = time.time()
+                        self.emit('progress', done=done, total=total, successful=successful,
+                                  failed=done - successful - skipped, skipped=skipped, elapsed=round(last_progress - start_time, 3))
+            # Skipped requests are not journaled, so a run that skipped any is not done yet
+            completed = not interrupted and not skipped
+        finally:
+            if checkpoint:
+                # Keep the journal around for --resume unless the run finished
+                checkpoint.close(remove=completed)
+        
+        if interrupted:
+            raise KeyboardInterrupt
+        
+        elapsed = time.time() - start_time
+        latencies.sort()
+        return {
+            'total': total,
+            'unique_tested': len(unique_apis),
+            'resumed': resumed,
+            'successful': successful,
+            'failed': total - successful - skipped,
+            'skipped': skipped,
+            'success_rate': round(successful / total * 100, 2) if total else 0,
+            'p50': round(percentile(latencies, 50), 4),
+            'p95': round(percentile(latencies, 95), 4),
+            'elapsed': round(elapsed, 3),
+            'requests_per_second': round((len(unique_apis) - resumed) / elapsed, 2) if elapsed else 0,
+            'retry_budget': self.tester.retry_policy.budget.snapshot(),
+            'circuit_breakers': self.tester.breakers.summary(),
+            'rate_limits': self.tester.rate_limiter.summary(),
+            'host_concurrency': self.host_concurrency.summary() if self.host_concurrency else {},
+            'schedule': {**schedule, 'actual': round(elapsed, 3)},
+            'deadline': deadline.snapshot() if deadline.seconds is not None else None
+        }
+
+def check_thresholds(summary, min_success_rate=None, max_failures=None, max_p95=None, max_untested=None):
+    """Return a description of every threshold the summary breaches"""
+    breaches = []
+    if min_success_rate is not None and summary['success_rate'] < min_success_rate:
+        breaches.append(f"success rate {summary['success_rate']}% < {min_success_rate}%")
+    if max_failures is not None and summary['failed'] > max_failures:
+        breaches.append(f"{summary['failed']} failures > {max_failures}")
+    if max_p95 is not None and summary['p95'] > max_p95:
+        breaches.append(f"p95 {summary['p95']}s > {max_p95}s")
+    if max_untested is not None and summary['skipped'] > max_untested:
+        breaches.append(f"{summary['skipped']} untested > {max_untested}")
+    return breaches
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py run',
+        description='Parse, test and export a DevTools capture or HAR file without prompts'
+    )
+    parser.add_argument('--input', '-i', required=True, help="capture file (raw DevTools text or .har), '-' for stdin")
+    parser.add_argument('--output', '-o', default='-', help="results file, '-' for stdout (default)")
+    parser.add_argument('--format', '-f', choices=['jsonl', 'csv'], default='jsonl', help='results format')
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='parallel requests (default 16)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='do not adapt concurrency per host; any host may use every worker')
+    parser.add_argument('--method', action='append', help='only test this HTTP method (repeatable)')
+    parser.add_argument('--host', action='append', help='only test this host (repeatable)')
+    parser.add_argument('--match', help='only test URLs matching this regex')
+    parser.add_argument('--include-resources', action='store_true', help='also test .js/.css resources')
+    parser.add_argument('--critical', action='append', default=[],
+                        help='test URLs matching this regex before all others (repeatable)')
+    parser.add_argument('--history', action='append', default=[],
+                        help='earlier results file to order by latency (repeatable; default: --output if it exists)')
+    parser.add_argument('--header', action='append', default=[], help="extra header 'Name: value' (repeatable)")
+    parser.add_argument('--cookie', action='append', default=[], help='extra cookie name=value (repeatable)')
+    parser.add_argument('--login-url', help='log in before testing')
+    parser.add_argument('--username', help='login username')
+    parser.add_argument('--password-env', default='API_TESTER_PASSWORD',
+                        help='environment variable holding the login password')
+    parser.add_argument('--export', help='write code for working APIs to this .zip or .tar.gz')
+    parser.add_argument('--include-response', action='store_true', help='include response bodies in results')
+    parser.add_argument('--min-success-rate', type=float, help='fail the run below this success rate (%%)')
+    parser.add_argument('--max-failures', type=int, help='fail the run above this many failed requests')
+    parser.add_argument('--max-untested', type=int,
+                        help='fail the run above this many requests left untested (deadline or open circuit)')
+    parser.add_argument('--max-p95', type=float, help='fail the run above this p95 latency (seconds)')
+    parser.add_argument('--breaker-threshold', type=int, default=3,
+                        help='open a host circuit after this many connect errors/timeouts in a row')
+    parser.add_argument('--breaker-reset', type=float, default=30,
+                        help='seconds before an open circuit lets a probe through')
+    parser.add_argument('--retries', type=int, default=2, help='extra attempts for transient failures (default 2)')
+    parser.add_argument('--retry-budget', type=float, default=10,
+                        help='cap retries at this percentage of requests (default 10)')
+    parser.add_argument('--retry-non-idempotent', action='store_true',
+                        help='also retry POST/PATCH after errors the server may have acted on')
+    parser.add_argument('--checkpoint', help='journal finished requests here (default: <output>.checkpoint)')
+    parser.add_argument('--resume', action='store_true', help='skip requests finished by an interrupted run')
+    parser.add_argument('--deadline', type=float,
+                        help='finish the whole run within this many seconds; what cannot start in time is skipped')
+    parser.add_argument('--timeout', type=float, default=15, help='longest timeout for one request (default 15s)')
+    parser.add_argument('--progress-interval', type=float, default=1.0, help='seconds between progress events')
+    parser.add_argument('--verbose', '-v', action='store_true', help='show per-request log lines on stderr')
+    return parser
+
+def parse_pairs(values, separator):
+    """Turn ['a=b', ...] style options into a dict"""
+    pairs = {}
+    for value in values:
+        if separator not in value:
+            raise ValueError(f"Expected name{separator}value, got: {value}")
+        key, item = value.split(separator, 1)
+        pairs[key.strip()] = item.strip()
+    return pairs
+
+def login(runner, args):
+    """Log in once for the whole run
+    
+    Returns the session cookies and, when the session came from the pool,
+    a callable that replaces it if the server has expired it.
+    """
+    from advanced_login import UniversalLoginSystem
+    
+    password = os.environ.get(args.password_env)
+    if not args.username or password is None:
+        raise ValueError(f"--login-url needs --username and the password in ${args.password_env}")
+    
+    runner.emit('login', url=args.login_url)
+    login_system = UniversalLoginSystem()
+    login_result = login_system.get_session(args.login_url, args.username, password)
+    if not login_result['success']:
+        raise ValueError(f"Login failed: {login_result.get('error', 'Unknown error')}")
+    
+    # A fresh login that gets 401/403 is not an expired session - only retry pooled ones
+    relogin = None
+    if login_result.get('reused'):
+        relogin = lambda: login_system.relogin(args.login_url, args.username, password)
+    return login_result['cookies'], relogin
+
+def run_cli(argv=None):
+    """Entry point for `main.py run`; returns the process exit code"""
+    args = build_arg_parser().parse_args(argv)
+    # The budget covers the whole command, login included
+    deadline = Deadline(args.deadline, args.timeout)
+    
+    # Tester and parser log lines are for humans: keep them off stdout
+    log_stream = sys.stderr if args.verbose else open(os.devnull, 'w')
+    try:
+        return run_pipeline(args, deadline, log_stream)
+    finally:
+        if log_stream is not sys.stderr:
+            log_stream.close()
+
+def run_pipeline(args, deadline, log_stream):
+    """Parse, test and export for run_cli with tester logs going to log_stream"""
+    progress_stream = sys.stderr
+    retry_policy = RetryPolicy(max_attempts=args.retries + 1, retry_non_idempotent=args.retry_non_idempotent,
+                               budget=RetryBudget(ratio=args.retry_budget / 100))
+    tester = APITester(HostCircuitBreakers(args.breaker_threshold, args.breaker_reset), retry_policy,
+                       deadline=deadline)
+    runner = BatchRunner(tester, concurrency=args.concurrency, progress_interval=args.progress_interval,
+                         progress_stream=progress_stream, adaptive=not args.fixed_concurrency)
+    
+    try:
+        if args.resume and not args.checkpoint and args.output == '-':
+            raise ValueError('--resume needs --checkpoint when results go to stdout')
+        
+        with redirect_stdout(log_stream):
+            if args.input == '-':
+                content = sys.stdin.read()
+            else:
+                with open(args.input, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            
+            apis = runner.parser.parse_capture(content)
+            apis = runner.filter_requests(apis, args.method, args.host, args.match, args.include_resources)
+            if not apis:
+                raise ValueError('No API endpoints left to test')
+            
+            extra_headers = parse_pairs(args.header, ':')
+            extra_cookies = parse_pairs(args.cookie, '=')
+            if extra_headers or extra_cookies:
+                apis = [dict(api, headers={**api.get('headers', {}), **extra_headers},
+                             cookies={**api.get('cookies', {}), **extra_cookies}) for api in apis]
+            
+            critical = [re.compile(pattern) for pattern in args.critical]
+            if critical:
+                apis = [dict(api, tags=[*api.get('tags', []), CRITICAL_TAG])
+                        if any(pattern.search(api['url']) for pattern in critical) else api for api in apis]
+            
+            for path in args.history:
+                runner.history.load(path)
+            if not args.history and args.output != '-' and os.path.exists(args.output):
+                # The previous run's results are about to be overwritten - learn from them first
+                try:
+                    runner.history.load(args.output)
+                except (OSError, ValueError):
+                    pass
+            
+            auth_cookies, relogin = login(runner, args) if args.login_url else (None, None)
+    except (OSError, ValueError, re.error) as e:
+        runner.emit('error', error=str(e))
+        return EXIT_INPUT
+    
+    checkpoint_path = args.checkpoint or (f'{args.output}.checkpoint' if args.output != '-' else None)
+    checkpoint = RunCheckpoint(checkpoint_path) if checkpoint_path else None
+    
+    # Resumed results are replayed into the output, so it is always rewritten
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        writer = ResultWriter(output, args.format, args.include_response)
+        with redirect_stdout(log_stream):
+            summary = runner.run(apis, writer, auth_cookies, checkpoint, args.resume, relogin)
+    except KeyboardInterrupt:
+        runner.emit('interrupted', checkpoint=checkpoint_path)
+        return EXIT_INTERRUPTED
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    if args.export:
+        from export_pipeline import ExportPipeline
+        
+        archive_format = 'tar' if args.export.endswith(('.tar.gz', '.tgz')) else 'zip'
+        working = [result['api_info'] for result in runner.tester.working_apis]
+        stats = ExportPipeline().export_archive(working, args.export, archive_format)
+        runner.emit('export', path=args.export, apis=len(working), files=stats['files'])
+    
+    breaches = check_thresholds(summary, args.min_success_rate, args.max_failures, args.max_p95, args.max_untested)
+    runner.emit('summary', **summary, breaches=breaches)
+    return EXIT_THRESHOLD if breaches else EXIT_OK
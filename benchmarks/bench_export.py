@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark exporting every format for a large set of working APIs
+
+Compares writing one file per API and format (what "Save All Codes" did)
+with streaming everything into a single zip, serially and with a process
+pool.
+
+Usage: python benchmarks/bench_export.py [endpoints] [workers]
+"""
+import os
+import sys
+import json
+import time
+import zipfile
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_tester import APITester
+from code_exporter import CodeExporter
+from export_pipeline import ExportPipeline, FORMATS
+
+def build_apis(count):
+    """Synthetic endpoints shaped like parsed DevTools requests"""
+    methods = ['GET', 'POST', 'PUT', 'DELETE']
+    return [
+        {
+            'url': f'https://api.example.com/v1/resource/{i}/items',
+            'method': methods[i % len(methods)],
+            'headers': {
+                'Accept': 'application/json',
+                'User-Agent': 'Mozilla/5.0',
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            'cookies': {'session': '8f14e45fceea167a5a36dedd4bea2543'},
+            'params': {'page': str(i % 10), 'limit': '50'},
+            'json_body': {'id': i, 'tags': ['a', 'b']} if i % 2 else None
+        }
+        for i in range(count)
+    ]
+
+def export_per_file(apis, directory):
+    """One open/write per API and format"""
+    tester = APITester()
+    exporter = CodeExporter()
+    
+    for i, api_info in enumerate(apis, 1):
+        outputs = {
+            '.py': tester.generate_python_code({'api_info': api_info}),
+            '_requests.py': exporter.export_python_code(api_info),
+            '.sh': exporter.export_curl_code(api_info),
+            '.js': exporter.export_javascript_code(api_info),
+            '_info.json': json.dumps(api_info, indent=2, ensure_ascii=False)
+        }
+        for suffix, text in outputs.items():
+            with open(os.path.join(directory, f'api_{i}{suffix}'), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    apis = build_apis(count)
+    
+    start_time = time.time()
+    rendered = sum(len(text) for name, text in ExportPipeline().iter_rendered(apis))
+    render_time = time.time() - start_time
+    
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        files_dir = os.path.join(tmp, 'files')
+        os.makedirs(files_dir)
+        
+        start_time = time.time()
+        export_per_file(apis, files_dir)
+        per_file_time = time.time() - start_time
+        
+        for label, pipeline, archive_format, level in [
+            ('zip, stored', ExportPipeline(), 'zip', 0),
+            ('zip, deflate level 1', ExportPipeline(), 'zip', 1),
+            ('tar.gz, level 1', ExportPipeline(), 'tar', 1),
+            (f'zip, stored, {workers} workers', ExportPipeline(workers=workers), 'zip', 0)
+        ]:
+            path = os.path.join(tmp, f'export_{len(runs)}.{archive_format}')
+            stats = pipeline.export_archive(apis, path, archive_format, compresslevel=level)
+            assert stats['files'] == count * len(FORMATS)
+            runs.append((label, stats['elapsed'], os.path.getsize(path)))
+        
+        with zipfile.ZipFile(os.path.join(tmp, 'export_0.zip')) as archive:
+            assert len(archive.namelist()) == count * len(FORMATS)
+    
+    print(f"{count} endpoints, {len(FORMATS)} formats, {rendered / 1024 / 1024:.1f} MiB rendered")
+    print(f"{'render only':<32} {render_time:8.2f} s")
+    print(f"{'per-file export':<32} {per_file_time:8.2f} s")
+    for label, elapsed, size in runs:
+        print(f"{label:<32} {elapsed:8.2f} s  ({per_file_time / elapsed:.1f}x, {size / 1024 / 1024:.1f} MiB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark cold-start import time of each entry point
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter
+for every entry point, keeps the best of several runs and lists the
+heaviest imports so regressions in startup cost are easy to spot.
+Modules that cannot be imported here (missing optional dependencies)
+are reported instead of timed.
+
+Usage: python benchmarks/bench_import_time.py [runs] [module ...]
+"""
+import os
+import re
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ['main', 'batch_runner', 'telegram_bot', 'cli_mode', 'desktop_ui']
+
+# import time: self [us] | cumulative | imported package
+IMPORT_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure(module):
+    """Import module in a fresh interpreter; returns (total_us, direct imports) or an error string"""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        return process.stderr.strip().splitlines()[-1], None
+    
+    # Children are printed before their parent, so collect depth-1 lines
+    # until the entry point's own top-level line closes them
+    children = []
+    for line in process.stderr.splitlines():
+        match = IMPORT_LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2))
+        depth = (len(match.group(3)) - 1) // 2
+        name = match.group(4)
+        if depth == 1:
+            children.append((cumulative, name))
+        elif depth == 0:
+            if name == module:
+                return cumulative, children
+            children = []
+    return 0, []
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    modules = sys.argv[2:] or ENTRY_POINTS
+    
+    for module in modules:
+        best = None
+        for _ in range(runs):
+            total, imports = measure(module)
+            if imports is None:
+                best = (total, None)
+                break
+            if best is None or total < best[0]:
+                best = (total, imports)
+        
+        total, imports = best
+        if imports is None:
+            print(f"{module:<16} not importable: {total}")
+            continue
+        
+        # Heaviest direct dependencies of the entry point itself
+        direct = sorted(imports, reverse=True)[:5]
+        print(f"{module:<16} {total / 1000:8.1f} ms")
+        for cumulative, name in direct:
+            print(f"{'':<16}   {cumulative / 1000:6.1f} ms  {name}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark login form detection on a heavy login page
+
+Compares the original html.parser implementation with the current
+detect_login_form (lxml when installed, forms only) and with the cached
+layout fast path used by repeated logins.
+
+Usage: python benchmarks/bench_login_form.py [iterations]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from advanced_login import UniversalLoginSystem, HTML_PARSER
+
+def legacy_detect_login_form(html_content):
+    """detect_login_form as it was before the fast path"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    login_info = {
+        'username_field': 'username',
+        'password_field': 'password', 
+        'captcha_field': None,
+        'form_action': None,
+        'form_data': {}
+    }
+    
+    forms = soup.find_all('form')
+    for form in forms:
+        form_action = form.get('action', '')
+        
+        if any(keyword in form_action.lower() for keyword in ['login', 'signin', 'auth', '']) or \
+           any(keyword in str(form).lower() for keyword in ['username', 'password', 'login']):
+            
+            login_info['form_action'] = form_action
+            
+            inputs = form.find_all('input')
+            for input_field in inputs:
+                input_name = input_field.get('name', '')
+                input_type = input_field.get('type', '').lower()
+                input_value = input_field.get('value', '')
+                
+                if input_type == 'text' and any(keyword in input_name.lower() for keyword in ['user', 'email', 'login']):
+                    login_info['username_field'] = input_name
+                elif input_type == 'password':
+                    login_info['password_field'] = input_name
+                elif any(keyword in input_name.lower() for keyword in ['captcha', 'capt', 'code']):
+                    login_info['captcha_field'] = input_name
+                elif input_name and input_value and input_type not in ['submit', 'button']:
+                    login_info['form_data'][input_name] = input_value
+    
+    return login_info
+
+def build_login_page(token, blocks=2000):
+    """Login page padded with navigation, scripts and content like a real portal"""
+    filler = ''.join(
+        f'<div class="card" id="c{i}"><a href="/item/{i}">Item {i}</a>'
+        f'<p>Lorem ipsum dolor sit amet &amp; more text {i}</p>'
+        f'<script>var x{i} = {{"a": {i}}};</script></div>'
+        for i in range(blocks)
+    )
+    return f"""<!DOCTYPE html><html><head><title>Sign in</title></head><body>
+    <nav>{filler[:len(filler) // 2]}</nav>
+    <form action="/signin" method="post">
+        <input type="hidden" name="csrf_token" value="{token}">
+        <input type="hidden" name="nonce" value="n-{token[:8]}">
+        <input type="text" name="user_email" value="">
+        <input type="password" name="pass">
+        <label>What is 3 + 4 = ?</label><input type="text" name="captcha_answer">
+        <input type="checkbox" name="remember" value="1">
+        <input type="submit" value="Login">
+    </form>
+    <main>{filler[len(filler) // 2:]}</main>
+    </body></html>"""
+
+def timed(func, pages):
+    start = time.perf_counter()
+    for page in pages:
+        result = func(page)
+    return (time.perf_counter() - start) / len(pages), result
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = [build_login_page(f'{i:032x}') for i in range(iterations)]
+    url = 'https://example.com/login'
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        login = UniversalLoginSystem(layout_cache_file=os.path.join(tmp, 'layouts.json'))
+        
+        legacy_time, legacy_result = timed(legacy_detect_login_form, pages)
+        detect_time, detect_result = timed(login.detect_login_form, pages)
+        
+        login.get_login_form(url, pages[0])
+        cached_time, cached_result = timed(lambda page: login.get_login_form(url, page), pages)
+    
+    assert legacy_result == detect_result == cached_result, (legacy_result, detect_result, cached_result)
+    
+    print(f"Page size: {len(pages[0]) / 1024:.0f} KiB, {iterations} iterations, parser: {HTML_PARSER}")
+    print(f"{'legacy (html.parser, full tree)':<36} {legacy_time * 1000:8.2f} ms")
+    print(f"{'detect_login_form':<36} {detect_time * 1000:8.2f} ms  ({legacy_time / detect_time:.1f}x)")
+    print(f"{'cached layout fast path':<36} {cached_time * 1000:8.2f} ms  ({legacy_time / cached_time:.1f}x)")
+
+if __name__ == '__main__':
+    main()
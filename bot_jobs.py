@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import TokenBucket
+
+class JobRejected(Exception):
+    pass
+
+class JobQueueFull(JobRejected):
+    pass
+
+class JobRateLimited(JobRejected):
+    pass
+
+class BackgroundJobQueue:
+    def __init__(self, workers=4, max_size=100, max_per_chat=20, chat_rate=0.5, chat_burst=5, history=500):
+        self.workers = workers
+        self.max_size = max_size
+        self.max_per_chat = max_per_chat
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.history = history
+        self.jobs = {}
+        self.chat_queues = OrderedDict()
+        self.chat_buckets = {}
+        self.queued = 0
+        self.available = None
+        self.executor = None
+        self.worker_tasks = []
+        self.avg_wait = 0.0
+    
+    async def start(self):
+        """Start the worker tasks on the running event loop"""
+        self.available = asyncio.Semaphore(0)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bot-job')
+        self.worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        """Cancel the workers and release the thread pool"""
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def submit(self, chat_id, name, func, *args, on_done=None):
+        """Queue blocking work and return the job immediately
+        
+        func runs in the worker thread pool; on_done is awaited on the event
+        loop with the finished job. Raises JobQueueFull when the bot or the
+        chat is at its queue limit and JobRateLimited when the chat has used
+        up its token bucket.
+        """
+        if self.queued >= self.max_size:
+            raise JobQueueFull(f"Bot queue is full ({self.max_size} jobs), try again shortly")
+        
+        chat_queue = self.chat_queues.get(chat_id)
+        if chat_queue and len(chat_queue) >= self.max_per_chat:
+            raise JobQueueFull(f"You already have {len(chat_queue)} jobs queued, wait for some to finish")
+        
+        bucket = self.chat_buckets.setdefault(chat_id, TokenBucket(self.chat_rate, self.chat_burst))
+        retry_after = bucket.try_take()
+        if retry_after:
+            raise JobRateLimited(f"Too many requests, try again in {retry_after:.0f}s")
+        
+        job = {
+            'id': uuid.uuid4().hex[:8],
+            'chat_id': chat_id,
+            'name': name,
+            'status': 'queued',
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'func': func,
+            'args': args,
+            'on_done': on_done
+        }
+        
+        if chat_queue is None:
+            chat_queue = self.chat_queues[chat_id] = deque()
+        chat_queue.append(job)
+        self.queued += 1
+        self.available.release()
+        
+        self.jobs[job['id']] = job
+        return job
+    
+    def _next_job(self):
+        """Take the next job round-robin across chats"""
+        chat_id, chat_queue = self.chat_queues.popitem(last=False)
+        job = chat_queue.popleft()
+        if chat_queue:
+            # Chat goes to the back of the line behind everyone else
+            self.chat_queues[chat_id] = chat_queue
+        self.queued -= 1
+        return job
+    
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            await self.available.acquire()
+            job = self._next_job()
+            job['status'] = 'running'
+            job['started_at'] = time.time()
+            self.avg_wait = 0.8 * self.avg_wait + 0.2 * (job['started_at'] - job['submitted_at'])
+            
+            try:
+                job['result'] = await loop.run_in_executor(self.executor, job['func'], *job['args'])
+                job['status'] = 'done'
+            except Exception as e:
+                job['error'] = str(e)
+                job['status'] = 'failed'
+            finally:
+                job['finished_at'] = time.time()
+            
+            if job['on_done']:
+                try:
+                    await job['on_done'](job)
+                except Exception as e:
+                    print(f"Error reporting job {job['id']}: {e}")
+            
+            # Finished jobs keep only their summary
+            job.pop('func', None)
+            job.pop('args', None)
+            job.pop('on_done', None)
+            self._prune()
+    
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+    
+    def pending(self, chat_id=None):
+        """Number of jobs waiting for a worker, overall or for one chat"""
+        if chat_id is None:
+            return self.queued
+        return len(self.chat_queues.get(chat_id, ()))
+    
+    def running(self):
+        """Number of jobs currently being processed"""
+        return len([job for job in self.jobs.values() if job['status'] == 'running'])
+    
+    def stats(self, chat_id=None):
+        """Queue depth and wait times for /status"""
+        now = time.time()
+        oldest = [queue[0]['submitted_at'] for queue in self.chat_queues.values() if queue]
+        
+        return {
+            'queued': self.queued,
+            'max_size': self.max_size,
+            'running': self.running(),
+            'workers': self.workers,
+            'chat_queued': self.pending(chat_id) if chat_id is not None else None,
+            'avg_wait': self.avg_wait,
+            'oldest_wait': now - min(oldest) if oldest else 0
+        }
@@ -2,7 +2,6 @@
 import re
 import requests
 import base64
-from PIL import Image
 import io
 import math
 
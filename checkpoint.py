@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import re
+import hashlib
+import threading
+from datetime import datetime
+
+# Append-only journal of finished requests for resuming long runs. The first
+# line identifies the run (a hash of the fingerprints being tested); every
+# following line is one completed result. Appending keeps each checkpoint
+# O(1) on 20k-endpoint runs, and a line cut short by a crash is ignored.
+# Credentials are masked before journaling and the file is owner-only.
+
+REDACTED = '***'
+
+# Header, cookie, parameter and response keys that carry credentials
+SENSITIVE_KEY_RE = re.compile(
+    r'authoriz|auth[-_]|token|secret|passw|api[-_]?key|sess(ion)?[-_]?id|^sid$|cookie|csrf|xsrf|signature',
+    re.IGNORECASE
+)
+
+def _mask(value):
+    """Copy of value with every credential-looking key masked, at any depth"""
+    if isinstance(value, dict):
+        return {k: REDACTED if SENSITIVE_KEY_RE.search(str(k)) else _mask(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mask(item) for item in value]
+    return value
+
+def redact(result):
+    """Copy of a tester result that is safe to keep on disk"""
+    redacted = _mask(result)
+    # Every cookie value is a credential, whatever its name
+    redacted['cookies_used'] = {name: REDACTED for name in result.get('cookies_used') or {}}
+    if isinstance(redacted.get('api_info'), dict):
+        redacted['api_info']['cookies'] = {name: REDACTED for name in result['api_info'].get('cookies') or {}}
+    return redacted
+
+class RunCheckpoint:
+    def __init__(self, path, sync_interval=5.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        self.completed = {}
+        self.run_id = None
+        self.file = None
+        self.last_sync = 0
+        self.valid_size = 0
+    
+    @staticmethod
+    def make_run_id(fingerprints):
+        """Identify a run by the set of request fingerprints it tests"""
+        return hashlib.sha1('\n'.join(sorted(fingerprints)).encode('utf-8')).hexdigest()
+    
+    def load(self, run_id):
+        """Read a previous journal for run_id; returns the number of finished requests"""
+        self.completed = {}
+        self.valid_size = 0
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline() or b'{}')
+                if header.get('run_id') != run_id:
+                    return 0
+                self.valid_size = f.tell()
+                
+                for line in iter(f.readline, b''):
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                        self.completed[entry['fingerprint']] = entry['result']
+                    except (ValueError, KeyError):
+                        break
+                    self.valid_size = f.tell()
+        except (OSError, ValueError):
+            return 0
+        return len(self.completed)
+    
+    def open(self, run_id, resume=False):
+        """Start journaling run_id, appending to the loaded journal when resuming"""
+        self.run_id = run_id
+        if resume and self.completed:
+            # Drop a line left half-written by a crash before appending
+            os.truncate(self.path, self.valid_size)
+            os.chmod(self.path, 0o600)
+            self.file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.completed = {}
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # O_CREAT's mode does not apply to a journal left by an older run
+            os.chmod(self.path, 0o600)
+            self.file = os.fdopen(fd, 'w', encoding='utf-8')
+            self.file.write(json.dumps({'run_id': run_id, 'created': datetime.now().isoformat()}) + '\n')
+            self.file.flush()
+    
+    def record(self, fingerprint, result):
+        """Journal one finished request; fsynced at most every sync_interval seconds"""
+        result = redact(result)
+        line = json.dumps({'fingerprint': fingerprint, 'result': result}, ensure_ascii=False, default=str)
+        with self.lock:
+            self.completed[fingerprint] = result
+            self.file.write(line + '\n')
+            self.file.flush()
+            if time.time() - self.last_sync >= self.sync_interval:
+                os.fsync(self.file.fileno())
+                self.last_sync = time.time()
+    
+    def close(self, remove=False):
+        """Flush the journal; remove it once the run has finished"""
+        with self.lock:
+            if self.file:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
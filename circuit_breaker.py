@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import time
+import threading
+from urllib.parse import urlparse
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+def host_key(url):
+    """scheme://host[:port] of url - the unit breakers and rate limits apply to"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self.trips = 0
+        self.skipped = 0
+        self.probing = False
+        self.last_error = None
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """Whether a request may go out now
+        
+        Once reset_timeout has passed an open breaker half-opens and lets a
+        single probe through; everything else is refused until it reports.
+        """
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            
+            self.skipped += 1
+            return False
+    
+    def record_success(self):
+        """The host answered (any HTTP status) - close the breaker"""
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+    
+    def record_failure(self, error=None):
+        """A connect error or timeout; opens the breaker at the threshold"""
+        with self.lock:
+            self.failures += 1
+            self.last_error = error
+            
+            # A failed probe re-opens straight away
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probing = False
+    
+    def snapshot(self):
+        with self.lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'trips': self.trips,
+                'skipped': self.skipped,
+                'last_error': self.last_error
+            }
+
+class HostCircuitBreakers:
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self.lock = threading.Lock()
+    
+    def get(self, url):
+        """Breaker for the host (scheme + netloc) of url"""
+        host = host_key(url)
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+    
+    def summary(self):
+        """State of every breaker that has tripped at least once"""
+        with self.lock:
+            breakers = list(self.breakers.items())
+        return {host: breaker.snapshot() for host, breaker in breakers if breaker.trips}
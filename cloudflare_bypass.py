@@ -3,13 +3,19 @@ import requests
 import time
 import re
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import cloudscraper
+
+# cloudscraper and selenium are imported on first use; most runs never need them
 
 class CloudflareBypass:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper()
+        self._scraper = None
+    
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            import cloudscraper
+            self._scraper = cloudscraper.create_scraper()
+        return self._scraper
     
     def bypass_cloudflare(self, url):
         """Bypass Cloudflare protection"""
@@ -31,6 +37,9 @@ class CloudflareBypass:
     def selenium_bypass(self, url):
         """Use Selenium to bypass Cloudflare"""
         try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            
             options = Options()
             options.add_argument('--headless')
             options.add_argument('--no-sandbox')
@@ -1,127 +1,419 @@
 #!/usr/bin/env python3
 import json
 import os
+import re
+import pprint
 from datetime import datetime
+from urllib.parse import urlencode, urlparse, parse_qsl
+from export_pipeline import render_python_request, render_curl, render_javascript
+
+# Module-level names of the generated SDK that endpoint functions must not shadow
+SDK_RESERVED_NAMES = {
+    'threading', 'requests', 'HTTPAdapter', 'BASE_URL', 'TIMEOUT', 'POOL_SIZE',
+    'COMMON_HEADERS', 'COMMON_COOKIES', '_session', '_session_lock', 'get_session', '_merge', '_request'
+}
 
 class CodeExporter:
     def __init__(self):
-        self.formats = ['python', 'curl', 'javascript', 'nodejs']
+        self.formats = ['python', 'python_async', 'python_sdk', 'locust', 'k6', 'curl', 'javascript', 'nodejs']
     
     def export_python_code(self, request_data):
         """Generate Python code for the working request"""
-        code = f"""#!/usr/bin/env python3
-import requests
-import json
-
-# API Request generated by Universal API Tester
-# Generated on: {datetime.now().isoformat()}
-
-def make_request():
-    url = "{request_data['url']}"
-    method = "{request_data.get('method', 'GET')}"
+        return render_python_request(request_data)
     
-    headers = {json.dumps(request_data.get('headers', {}), indent=4)}
-    """
-        
-        if request_data.get('cookies'):
-            code += f"""
-    cookies = {json.dumps(request_data.get('cookies', {}), indent=4)}
-    """
-        else:
-            code += "\n    cookies = None\n"
+    def export_curl_code(self, request_data):
+        """Generate cURL command"""
+        return render_curl(request_data)
+    
+    def export_javascript_code(self, request_data):
+        """Generate JavaScript fetch code"""
+        return render_javascript(request_data)
+    
+    def _endpoint_spec(self, request_data):
+        """Reduce a request to the fields an exported client needs"""
+        method = request_data.get('method', 'GET').upper()
+        spec = {
+            'method': method,
+            'url': request_data['url'],
+            'headers': request_data.get('headers', {}),
+            'cookies': request_data.get('cookies', {})
+        }
         
         if request_data.get('json_body'):
-            code += f"""
-    json_data = {json.dumps(request_data.get('json_body', {}), indent=4)}
-    """
+            spec['json'] = request_data['json_body']
         elif request_data.get('data'):
-            code += f"""
-    data = "{request_data.get('data')}"
-    """
-        else:
-            code += "\n    data = None\n"
+            spec['data'] = request_data['data']
+        elif request_data.get('params'):
+            # DevTools captures keep form/query fields in params
+            params = {k: str(v) for k, v in request_data['params'].items()}
+            if method != 'GET':
+                spec['data'] = params
+            elif not set(params.items()) <= set(parse_qsl(urlparse(spec['url']).query, keep_blank_values=True)):
+                # The parser already appends GET params to the URL - only send them if it did not
+                spec['params'] = params
         
-        code += """
-    response = requests.request(
-        method=method,
-        url=url,
-        headers=headers,"""
+        return spec
+    
+    def export_async_client(self, requests_data, concurrency=50, retries=3):
+        """Generate an asyncio (aiohttp) client module for high-throughput replay
         
-        if request_data.get('cookies'):
-            code += "\n        cookies=cookies,"
+        The module shares one pooled ClientSession, caps in-flight requests
+        with a semaphore, retries 429/5xx and connection errors with
+        exponential backoff, and exposes run_many(n) to fire n calls spread
+        over all endpoints.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        endpoints = pprint.pformat([self._endpoint_spec(r) for r in requests_data], width=100, sort_dicts=False)
         
-        if request_data.get('json_body'):
-            code += "\n        json=json_data,"
-        elif request_data.get('data'):
-            code += "\n        data=data,"
+        code = f"""#!/usr/bin/env python3
+# Async API client generated by Universal API Tester
+# Generated on: {datetime.now().isoformat()}
+# Requires: pip install aiohttp
+
+import asyncio
+import random
+import sys
+import time
+
+import aiohttp
+
+CONCURRENCY = {concurrency}
+RETRIES = {retries}
+TIMEOUT = 30
+RETRY_STATUSES = {{429, 500, 502, 503, 504}}
+
+ENDPOINTS = {endpoints}
+"""
         
         code += """
-        timeout=30
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    print(f"Response: {response.text}")
-    
-    return response
+
+class AsyncAPIClient:
+    def __init__(self, concurrency=CONCURRENCY, retries=RETRIES, timeout=TIMEOUT):
+        # Semaphore(0) would block every call forever
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.session = None
+
+    async def __aenter__(self):
+        # One pooled connector shared by every request
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def call(self, endpoint):
+        \"\"\"Send one request, retrying transient failures with backoff\"\"\"
+        kwargs = {key: endpoint[key] for key in ('headers', 'cookies', 'params', 'data', 'json') if endpoint.get(key)}
+
+        async with self.semaphore:
+            for attempt in range(self.retries + 1):
+                start_time = time.perf_counter()
+                try:
+                    async with self.session.request(endpoint['method'], endpoint['url'], **kwargs) as response:
+                        body = await response.read()
+                        elapsed = time.perf_counter() - start_time
+                        if response.status not in RETRY_STATUSES or attempt == self.retries:
+                            return {'url': endpoint['url'], 'status': response.status, 'time': elapsed, 'size': len(body)}
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == self.retries:
+                        return {'url': endpoint['url'], 'status': 0, 'time': time.perf_counter() - start_time, 'error': str(e)}
+
+                # Full jitter keeps retries from synchronising
+                await asyncio.sleep(random.uniform(0, min(10, 0.2 * 2 ** attempt)))
+
+    async def run_many(self, n, endpoints=ENDPOINTS):
+        \"\"\"Fire n calls round-robin over endpoints and return every result\"\"\"
+        if not endpoints:
+            return []
+        tasks = [self.call(endpoints[i % len(endpoints)]) for i in range(n)]
+        return await asyncio.gather(*tasks)
+
+
+async def run_many(n, concurrency=CONCURRENCY):
+    async with AsyncAPIClient(concurrency=concurrency) as client:
+        return await client.run_many(n)
+
+
+def main():
+    if not ENDPOINTS:
+        print("No endpoints to call")
+        return
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else len(ENDPOINTS)
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else CONCURRENCY
+
+    start_time = time.perf_counter()
+    results = asyncio.run(run_many(n, concurrency))
+    elapsed = time.perf_counter() - start_time
+
+    ok = len([r for r in results if 200 <= r['status'] < 300])
+    times = sorted(r['time'] for r in results)
+    print(f"{n} requests in {elapsed:.2f}s ({n / elapsed:.1f} req/s), {ok} OK, {n - ok} failed")
+    if times:
+        print(f"p50 {times[len(times) // 2] * 1000:.0f}ms, p99 {times[min(len(times) - 1, int(len(times) * 0.99))] * 1000:.0f}ms")
+
 
 if __name__ == "__main__":
-    make_request()
+    main()
 """
         return code
     
-    def export_curl_code(self, request_data):
-        """Generate cURL command"""
-        curl_cmd = f"curl -X {request_data.get('method', 'GET')} \\\n"
-        curl_cmd += f"  '{request_data['url']}' \\\n"
-        
-        for key, value in request_data.get('headers', {}).items():
-            curl_cmd += f"  -H '{key}: {value}' \\\n"
-        
-        if request_data.get('json_body'):
-            json_str = json.dumps(request_data['json_body'])
-            curl_cmd += f"  --data-raw '{json_str}' \\\n"
-        elif request_data.get('data'):
-            curl_cmd += f"  --data-raw '{request_data['data']}' \\\n"
+    def export_locust_file(self, load_profile, wait_min=1, wait_max=3):
+        """Generate a Locust HttpUser with one weighted task per working API
         
-        curl_cmd += "  --compressed"
+        load_profile is APITester.get_load_profile(): each task's weight is
+        how often that request appeared in the capture.
+        """
+        code = f"""# Locust load test generated by Universal API Tester
+# Generated on: {datetime.now().isoformat()}
+# Run: locust -f locustfile.py --headless -u 50 -r 5 -t 5m
+
+from locust import HttpUser, between, task
+
+
+class CapturedTrafficUser(HttpUser):
+    # Requests use absolute URLs; host is only required by Locust
+    host = "{self._base_url(load_profile)}"
+    wait_time = between({wait_min}, {wait_max})
+"""
         
-        return curl_cmd
+        for i, entry in enumerate(load_profile, 1):
+            spec = self._endpoint_spec(entry['api_info'])
+            name = f"{spec['method']} {urlparse(spec['url']).path or '/'}"
+            
+            code += f"""
+    @task({entry['weight']})
+    def api_{i}(self):
+        self.client.request(
+            {spec['method']!r},
+            {spec['url']!r},
+            name={name!r},
+"""
+            for key in ('headers', 'cookies', 'params', 'data', 'json'):
+                if spec.get(key):
+                    value = pprint.pformat(spec[key], width=80, sort_dicts=False).replace('\n', '\n' + ' ' * (13 + len(key)))
+                    code += f"            {key}={value},\n"
+            code += "        )\n"
+        return code
     
-    def export_javascript_code(self, request_data):
-        """Generate JavaScript fetch code"""
-        js_code = f"""// API Request generated by Universal API Tester
+    def export_k6_script(self, load_profile, vus=50, duration='5m'):
+        """Generate a k6 script picking each working API by its captured frequency"""
+        endpoints = []
+        for entry in load_profile:
+            spec = self._endpoint_spec(entry['api_info'])
+            url = spec['url']
+            if spec.get('params'):
+                url += ('&' if '?' in url else '?') + urlencode(spec['params'])
+            
+            endpoint = {'weight': entry['weight'], 'method': spec['method'], 'url': url, 'headers': dict(spec['headers'])}
+            if spec.get('json'):
+                endpoint['body'] = json.dumps(spec['json'])
+                endpoint['headers'].setdefault('Content-Type', 'application/json')
+            elif spec.get('data'):
+                endpoint['body'] = spec['data']
+            endpoint['cookies'] = spec['cookies']
+            endpoints.append(endpoint)
+        
+        code = f"""// k6 load test generated by Universal API Tester
 // Generated on: {datetime.now().isoformat()}
+// Run: k6 run script.js
+
+import http from 'k6/http';
+import {{ check, sleep }} from 'k6';
+
+export const options = {{
+    vus: {vus},
+    duration: '{duration}',
+}};
 
-const url = '{request_data['url']}';
-const method = '{request_data.get('method', 'GET')}';
+const endpoints = {json.dumps(endpoints, indent=4, ensure_ascii=False)};
 """
         
-        js_code += f"""
-const headers = {json.dumps(request_data.get('headers', {}), indent=2)};
+        code += """
+const totalWeight = endpoints.reduce((sum, endpoint) => sum + endpoint.weight, 0);
+
+function pickEndpoint() {
+    let roll = Math.random() * totalWeight;
+    for (const endpoint of endpoints) {
+        roll -= endpoint.weight;
+        if (roll < 0) {
+            return endpoint;
+        }
+    }
+    return endpoints[endpoints.length - 1];
+}
+
+export default function () {
+    const endpoint = pickEndpoint();
+    const response = http.request(endpoint.method, endpoint.url, endpoint.body || null, {
+        headers: endpoint.headers,
+        cookies: endpoint.cookies,
+        tags: { name: `${endpoint.method} ${endpoint.url.split('?')[0]}` },
+    });
+    check(response, { 'status is 2xx': (r) => r.status >= 200 && r.status < 300 });
+    sleep(1);
+}
 """
+        return code
+    
+    def export_sdk_module(self, requests_data, pool_size=20):
+        """Generate one importable client module with a function per endpoint
         
-        if request_data.get('json_body'):
-            js_code += f"""
-const body = JSON.stringify({json.dumps(request_data.get('json_body', {}), indent=2)});
+        Headers and cookies shared by every endpoint are factored into module
+        constants and applied once to a shared pooled requests.Session. When
+        all endpoints live on one host, functions take paths relative to
+        BASE_URL.
+        """
+        specs = [self._endpoint_spec(r) for r in requests_data]
+        
+        common_headers = self._common_items([spec['headers'] for spec in specs])
+        common_cookies = self._common_items([spec['cookies'] for spec in specs])
+        hosts = {f"{urlparse(spec['url']).scheme}://{urlparse(spec['url']).netloc}" for spec in specs}
+        base_url = hosts.pop() if len(hosts) == 1 else ''
+        
+        code = f"""#!/usr/bin/env python3
+\"\"\"API client generated by Universal API Tester
+
+Generated on: {datetime.now().isoformat()}
+
+Import it and call the endpoint functions; they share one pooled session:
+
+    import api_client
+    response = api_client.{self._function_names(specs)[0] if specs else 'call'}()
+\"\"\"
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = {base_url!r}
+TIMEOUT = 30
+POOL_SIZE = {pool_size}
+
+COMMON_HEADERS = {pprint.pformat(common_headers, width=100, sort_dicts=False)}
+
+COMMON_COOKIES = {pprint.pformat(common_cookies, width=100, sort_dicts=False)}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    \"\"\"Shared session with connection pooling and the common headers/cookies\"\"\"
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(COMMON_HEADERS)
+                session.cookies.update(COMMON_COOKIES)
+                _session = session
+    return _session
+
+
+def _merge(defaults, overrides):
+    merged = dict(defaults or {{}})
+    merged.update(overrides or {{}})
+    return merged or None
+
+
+def _request(method, url, headers=None, cookies=None, params=None, data=None, json=None, timeout=TIMEOUT, **kwargs):
+    return get_session().request(
+        method,
+        BASE_URL + url,
+        headers=headers,
+        cookies=cookies,
+        params=params,
+        data=data,
+        json=json,
+        timeout=timeout,
+        **kwargs
+    )
+"""
+        
+        names = self._function_names(specs)
+        for name, spec in zip(names, specs):
+            url = spec['url'][len(base_url):] if base_url else spec['url']
+            headers = {k: v for k, v in spec['headers'].items() if k not in common_headers}
+            cookies = {k: v for k, v in spec['cookies'].items() if k not in common_cookies}
+            body_key = 'json' if 'json' in spec else 'data'
+            if spec.get(body_key):
+                body = self._aligned(f"        {body_key}={body_key} if {body_key} is not None else ", spec[body_key])
+            else:
+                body = f"        {body_key}={body_key}"
+            
+            code += f"""
+
+def {name}(params=None, {body_key}=None, headers=None, cookies=None, **kwargs):
+    \"\"\"{spec['method']} {spec['url']}\"\"\"
+    return _request(
+        {spec['method']!r},
+        {url!r},
+{self._aligned('        headers=_merge(', headers)}, headers),
+{self._aligned('        cookies=_merge(', cookies)}, cookies),
+{self._aligned('        params=_merge(', spec.get('params'))}, params),
+{body},
+        **kwargs
+    )
 """
-        else:
-            js_code += "\nconst body = null;\n"
-        
-        js_code += """
-fetch(url, {
-    method: method,
-    headers: headers,
-    body: body
-})
-.then(response => response.text())
-.then(data => {
-    console.log('Response:', data);
-})
-.catch(error => {
-    console.error('Error:', error);
-});
+        
+        code += f"""
+
+__all__ = {pprint.pformat(['get_session'] + names, width=100)}
 """
-        return js_code
+        return code
+    
+    def _common_items(self, dicts):
+        """Key/value pairs present with the same value in every dict"""
+        if not dicts:
+            return {}
+        common = dict(dicts[0])
+        for d in dicts[1:]:
+            common = {k: v for k, v in common.items() if d.get(k) == v}
+        return common
+    
+    def _function_names(self, specs):
+        """Unique snake_case function names like get_client_res_data_smscdr
+        
+        Names never shadow the SDK module's own helpers and imports.
+        """
+        names = []
+        for spec in specs:
+            path = urlparse(spec['url']).path
+            base = re.sub(r'[^0-9a-zA-Z]+', '_', f"{spec['method']}_{path}").strip('_').lower()
+            if base[0].isdigit():
+                base = f"call_{base}"
+            name = base
+            suffix = 2
+            while name in names or name in SDK_RESERVED_NAMES:
+                name = f"{base}_{suffix}"
+                suffix += 1
+            names.append(name)
+        return names
+    
+    def _literal(self, value, indent):
+        """Python literal for generated code, continuation lines indented"""
+        return pprint.pformat(value or None, width=80, sort_dicts=False).replace('\n', '\n' + ' ' * indent)
+    
+    def _aligned(self, prefix, value):
+        """prefix followed by value's literal, continuation lines lined up under it"""
+        return prefix + self._literal(value, len(prefix))
+    
+    def _base_url(self, load_profile):
+        for entry in load_profile:
+            parsed = urlparse(entry['api_info']['url'])
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return "http://localhost"
     
     def save_code_file(self, code, filename, format_type):
         """Save code to file"""
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import time
+import threading
+from circuit_breaker import host_key
+
+# Additive-increase/multiplicative-decrease concurrency limit per host. While
+# the host is kept busy, healthy responses raise its limit by about one per
+# limit's worth of responses (one per round trip, as TCP does). An overload
+# signal cuts it by backoff_ratio: a connection error, timeout or
+# 429/502/503/504, or a sustained rise in latency - several answers in a row
+# well above their baseline. The baseline is the endpoint's own smoothed
+# latency once it has one, else the host's, so a host whose endpoints simply
+# differ in speed is not mistaken for an overloaded one. Each host settles
+# where it stays fast, instead of every host sharing one fixed number.
+
+OVERLOAD_STATUSES = {429, 502, 503, 504}
+
+class AIMDLimit:
+    def __init__(self, initial=4, min_limit=1, max_limit=64, backoff_ratio=0.5, latency_tolerance=2.0,
+                 sustain=5, smoothing=0.2):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.sustain = sustain
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.peak = int(self.limit)
+        self.increases = 0
+        self.decreases = 0
+        self.samples = 0
+        self.errors = 0
+        self.min_latency = None
+        self.host_latency = None
+        self.endpoint_latency = {}
+        self.slow_streak = 0
+        self.last_decrease = 0
+        self.lock = threading.Lock()
+    
+    def available(self):
+        with self.lock:
+            return self.in_flight < int(self.limit)
+    
+    def acquire(self):
+        """Count a request going out; returns its start time for release"""
+        with self.lock:
+            self.in_flight += 1
+            return time.monotonic()
+    
+    def _smooth(self, average, sample):
+        return sample if average is None else average + self.smoothing * (sample - average)
+    
+    def _slow(self, endpoint, latency):
+        """Compare latency with its baseline, then fold it into the averages"""
+        baseline = self.endpoint_latency.get(endpoint, self.host_latency)
+        # Small floor so a 5ms baseline does not flag a 15ms answer
+        slow = baseline is not None and latency > max(baseline * self.latency_tolerance, baseline + 0.05)
+        
+        self.host_latency = self._smooth(self.host_latency, latency)
+        if endpoint:
+            self.endpoint_latency[endpoint] = self._smooth(self.endpoint_latency.get(endpoint), latency)
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        
+        self.slow_streak = self.slow_streak + 1 if slow else 0
+        return self.slow_streak >= self.sustain
+    
+    def release(self, started, result):
+        """Feed one finished request back into the limit"""
+        latency = result.get('response_time') or 0
+        status = result.get('status_code') or 0
+        endpoint = (result.get('api_info') or {}).get('fingerprint')
+        overloaded = not status or status in OVERLOAD_STATUSES
+        
+        with self.lock:
+            self.in_flight -= 1
+            if result.get('skipped'):
+                return
+            
+            self.samples += 1
+            self.errors += 1 if overloaded else 0
+            if not overloaded:
+                overloaded = self._slow(endpoint, latency)
+            
+            if overloaded:
+                self.slow_streak = 0
+                # Requests sent before the last cut saw the old limit; count one cut per window
+                if started >= self.last_decrease:
+                    self.limit = float(max(self.min_limit, int(self.limit * self.backoff_ratio)))
+                    self.last_decrease = time.monotonic()
+                    self.decreases += 1
+            elif self.in_flight + 1 >= self.limit / 2 and self.limit < self.max_limit:
+                # Only grow while the host is actually using the limit it has
+                grown = min(self.max_limit, self.limit + 1 / self.limit)
+                if int(grown) > int(self.limit):
+                    self.increases += 1
+                self.limit = grown
+                self.peak = max(self.peak, int(self.limit))
+    
+    def snapshot(self):
+        with self.lock:
+            return {
+                'limit': int(self.limit),
+                'peak': self.peak,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'error_rate': round(self.errors / self.samples, 4) if self.samples else 0,
+                'min_latency': round(self.min_latency, 4) if self.min_latency is not None else None
+            }
+
+class HostConcurrency:
+    def __init__(self, initial=4, max_limit=64, **options):
+        self.initial = initial
+        self.max_limit = max_limit
+        self.options = options
+        self.limits = {}
+        self.lock = threading.Lock()
+    
+    def get(self, url):
+        """Limit for the host (scheme + netloc) of url"""
+        host = host_key(url)
+        with self.lock:
+            if host not in self.limits:
+                self.limits[host] = AIMDLimit(self.initial, max_limit=self.max_limit, **self.options)
+            return self.limits[host]
+    
+    def summary(self):
+        """Converged limit of every host seen in the run"""
+        with self.lock:
+            limits = list(self.limits.items())
+        return {host: limit.snapshot() for host, limit in limits}
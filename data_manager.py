@@ -1,10 +1,14 @@
 import json
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
 class DataManager:
-    def __init__(self, base_path="."):
+    def __init__(self, base_path=".", lock=None):
         self.base_path = base_path
+        # Serialises writers of this store only; other stores write in parallel
+        self.lock = lock or threading.Lock()
         self.ensure_directories()
         
     def ensure_directories(self):
@@ -15,17 +19,37 @@ class DataManager:
         """Save API response to multiple formats"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save to data.json (append to array)
-        self._save_to_json('data.json', response_data)
-        
-        # Save to data.txt (human readable)
-        self._save_to_txt('data.txt', response_data)
+        with self.lock:
+            # Save to data.json (append to array)
+            self._save_to_json('data.json', response_data)
+            
+            # Save to data.txt (human readable)
+            self._save_to_txt('data.txt', response_data)
+            
+            # Check for earnings and save accordingly
+            self._check_earnings(response_data)
+            
+            # Log to system log
+            self._log_system(response_data)
+    
+    def path(self, filename):
+        """Full path of a file inside this store"""
+        return os.path.join(self.base_path, filename)
+    
+    def load_results(self):
+        """All saved responses of this store as a list"""
+        filepath = self.path('data.json')
+        if not os.path.exists(filepath):
+            return []
         
-        # Check for earnings and save accordingly
-        self._check_earnings(response_data)
+        with self.lock:
+            with open(filepath, 'r') as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    return []
         
-        # Log to system log
-        self._log_system(response_data)
+        return data if isinstance(data, list) else [data]
         
     def _save_to_json(self, filename, data):
         filepath = os.path.join(self.base_path, filename)
@@ -141,4 +165,31 @@ class DataManager:
     def _export_csv(self):
         """Export data as CSV (simplified)"""
         # Implementation for CSV export
-        pass
\ No newline at end of file
+        pass
+
+class DataStorePool:
+    def __init__(self, root="data", max_open=128):
+        self.root = root
+        self.max_open = max_open
+        self.stores = OrderedDict()
+        # Locks outlive evicted stores so a reopened store shares its lock
+        # with writers still holding the old instance
+        self.locks = {}
+        self.lock = threading.Lock()
+        
+    def get(self, key):
+        """Return the store for key (e.g. a chat id), opening it if needed"""
+        key = str(key)
+        with self.lock:
+            store = self.stores.get(key)
+            if store:
+                self.stores.move_to_end(key)
+                return store
+            
+            lock = self.locks.setdefault(key, threading.Lock())
+            store = DataManager(os.path.join(self.root, key), lock)
+            self.stores[key] = store
+            
+            while len(self.stores) > self.max_open:
+                self.stores.popitem(last=False)
+            return store
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import time
+
+# Wall-clock budget for a whole run. Each request's timeout is whatever is
+# left of the budget (capped at request_timeout), so the last requests of a
+# run cannot overrun it; once less than min_timeout is left nothing new is
+# started and the rest of the run is recorded as untested.
+
+DEADLINE_REASON = 'deadline reached'
+
+class Deadline:
+    def __init__(self, seconds=None, request_timeout=15, min_timeout=1.0):
+        self.seconds = seconds
+        self.request_timeout = request_timeout
+        self.min_timeout = min_timeout
+        self.started = time.monotonic()
+    
+    def remaining(self):
+        """Seconds left in the budget, or None without a deadline"""
+        if self.seconds is None:
+            return None
+        return self.seconds - (time.monotonic() - self.started)
+    
+    def timeout(self, wait=0):
+        """Timeout for a request that starts after wait seconds, or None if it cannot fit"""
+        remaining = self.remaining()
+        if remaining is None:
+            return self.request_timeout
+        budget = remaining - wait
+        if budget < self.min_timeout:
+            return None
+        return min(self.request_timeout, budget)
+    
+    def closing_in(self):
+        """Seconds until no new request may start, or None without a deadline"""
+        remaining = self.remaining()
+        return None if remaining is None else max(0, remaining - self.min_timeout)
+    
+    def snapshot(self):
+        remaining = self.remaining()
+        return {
+            'budget': self.seconds,
+            'remaining': round(max(0, remaining), 3) if remaining is not None else None,
+            'request_timeout': self.request_timeout
+        }
@@ -1,7 +1,19 @@
 #!/usr/bin/env python3
 import re
 import json
-from urllib.parse import urljoin, urlparse, parse_qs
+import hashlib
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+
+# Headers that change between otherwise identical captures (tracing ids,
+# caching validators, response metadata) and never affect what the API returns
+VOLATILE_HEADERS = {
+    'date', 'age', 'expires', 'etag', 'last-modified', 'if-none-match',
+    'if-modified-since', 'cache-control', 'pragma', 'connection', 'keep-alive',
+    'content-length', 'accept-encoding', 'accept-language', 'referer', 'origin',
+    'user-agent', 'priority', 'server', 'set-cookie', 'via', 'vary',
+    'x-request-id', 'x-correlation-id', 'x-amzn-trace-id', 'x-cache',
+    'traceparent', 'tracestate', 'cf-ray', 'report-to', 'nel'
+}
 
 class AdvancedDevToolsParser:
     def __init__(self):
@@ -85,6 +97,58 @@ class AdvancedDevToolsParser:
         print(f"✅ Found {len(normalized_requests)} API endpoints")
         return normalized_requests
     
+    def parse_har(self, content):
+        """Parse a HAR export (DevTools "Save all as HAR") into requests"""
+        har = json.loads(content) if isinstance(content, str) else content
+        
+        normalized_requests = []
+        for entry in har.get('log', {}).get('entries', []):
+            entry_request = entry.get('request', {})
+            if not entry_request.get('url', '').startswith('http'):
+                continue
+            
+            request = {
+                'url': entry_request['url'],
+                'method': entry_request.get('method', 'GET').upper(),
+                'headers': {},
+                'cookies': {}
+            }
+            
+            # HTTP/2 pseudo headers (:authority, :path ...) are not real headers
+            for header in entry_request.get('headers', []):
+                if not header['name'].startswith(':'):
+                    request['headers'][header['name']] = header['value']
+            for cookie in entry_request.get('cookies', []):
+                request['cookies'][cookie['name']] = cookie['value']
+            
+            # GET query strings are already part of the URL
+            post_data = entry_request.get('postData') or {}
+            if post_data.get('params'):
+                request['params'] = {p['name']: p.get('value', '') for p in post_data['params']}
+            elif post_data.get('text'):
+                try:
+                    request['json_body'] = json.loads(post_data['text'])
+                except ValueError:
+                    request['data'] = post_data['text']
+            
+            normalized = self._normalize_request(request)
+            if normalized:
+                normalized_requests.append(normalized)
+        
+        print(f"✅ Found {len(normalized_requests)} API endpoints")
+        return normalized_requests
+    
+    def parse_capture(self, content):
+        """Parse either a HAR file or raw DevTools text, detected from the content"""
+        if content.lstrip().startswith('{'):
+            try:
+                har = json.loads(content)
+            except ValueError:
+                har = None
+            if isinstance(har, dict) and 'log' in har:
+                return self.parse_har(har)
+        return self.parse_raw_devtools(content)
+    
     def _parse_cookies(self, cookie_string, request):
         """Parse cookie string into dictionary"""
         if 'cookies' not in request:
@@ -168,6 +232,68 @@ class AdvancedDevToolsParser:
         """Extract data APIs that need testing"""
         return [req for req in requests if req['api_type'] in ['data_api', 'unknown'] and not req['api_type'] == 'resource']
     
+    def canonicalize_request(self, request):
+        """Build a canonical form of a request with volatile parts removed"""
+        parsed = urlparse(request['url'])
+        query = sorted(parse_qsl(parsed.query, keep_blank_values=True))
+        url = urlunparse((
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path or '/',
+            '',
+            urlencode(query),
+            ''
+        ))
+        
+        headers = {}
+        for key, value in request.get('headers', {}).items():
+            key = key.strip().lower()
+            # Cookies are compared through the parsed cookie jar instead
+            if key in VOLATILE_HEADERS or key == 'cookie' or key.startswith('sec-'):
+                continue
+            headers[key] = value.strip()
+        
+        # Same URL with a different body is a different request
+        body = request.get('json_body')
+        body = json.dumps(body, sort_keys=True) if body is not None else request.get('data')
+        
+        return {
+            'method': request.get('method', 'GET').upper(),
+            'url': url,
+            'params': sorted((str(k), str(v)) for k, v in (request.get('params') or {}).items()),
+            'headers': sorted(headers.items()),
+            'cookies': sorted((str(k), str(v)) for k, v in (request.get('cookies') or {}).items()),
+            'body': hashlib.sha1(str(body).encode('utf-8')).hexdigest() if body is not None else None
+        }
+    
+    def fingerprint_request(self, request):
+        """Return a stable fingerprint identifying duplicate requests"""
+        canonical = json.dumps(self.canonicalize_request(request), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+    
+    def deduplicate_requests(self, requests):
+        """Group identical requests so each one is tested only once
+        
+        Returns the list of unique requests (first occurrence, capture order)
+        and a dict mapping each fingerprint to every request that shares it.
+        """
+        unique = []
+        groups = {}
+        
+        for req in requests:
+            fingerprint = self.fingerprint_request(req)
+            req['fingerprint'] = fingerprint
+            if fingerprint not in groups:
+                groups[fingerprint] = []
+                unique.append(req)
+            groups[fingerprint].append(req)
+        
+        duplicates = len(requests) - len(unique)
+        if duplicates:
+            print(f"🧬 Deduplicated {len(requests)} requests to {len(unique)} unique ({duplicates} duplicates)")
+        
+        return unique, groups
+    
     def get_base_url(self, requests):
         """Extract base URL from requests"""
         for req in requests:
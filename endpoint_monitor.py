@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+import requests
+
+def parse_interval(text):
+    """Parse '30', '30s', '5m', '1h' into seconds"""
+    match = re.fullmatch(r'(\d+)\s*([smh]?)', text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid interval: {text}")
+    return int(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+class EndpointMonitor:
+    def __init__(self, watch_file='watchlist.json', tick=5, batch_size=20, jitter=0.1,
+                 latency_threshold=2.0, min_interval=10, max_per_chat=50, timeout=15):
+        self.watch_file = watch_file
+        self.tick = tick
+        self.batch_size = batch_size
+        self.jitter = jitter
+        self.latency_threshold = latency_threshold
+        self.min_interval = min_interval
+        self.max_per_chat = max_per_chat
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.watches = self._load()
+    
+    def _load(self):
+        try:
+            with open(self.watch_file, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save(self):
+        try:
+            tmp_file = self.watch_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(self.watches, f, indent=2)
+            os.replace(tmp_file, self.watch_file)
+        except Exception as e:
+            print(f"Error saving watch list: {e}")
+    
+    def add(self, chat_id, url, interval, latency_threshold=None):
+        """Watch url for a chat; replaces an existing watch on the same URL"""
+        if interval < self.min_interval:
+            raise ValueError(f"Interval must be at least {self.min_interval}s")
+        
+        existing = [w for w in self.list(chat_id) if w['url'] == url]
+        if not existing and len(self.list(chat_id)) >= self.max_per_chat:
+            raise ValueError(f"You can watch at most {self.max_per_chat} endpoints")
+        for watch in existing:
+            del self.watches[watch['id']]
+        
+        watch = {
+            'id': uuid.uuid4().hex[:8],
+            'chat_id': chat_id,
+            'url': url,
+            'interval': interval,
+            'latency_threshold': latency_threshold or self.latency_threshold,
+            # First check lands somewhere in the first interval so watches
+            # added together don't fire together
+            'next_check': time.time() + random.uniform(0, interval),
+            'state': None,
+            'status_code': None,
+            'response_time': None,
+            'last_check': None
+        }
+        self.watches[watch['id']] = watch
+        self._save()
+        return watch
+    
+    def remove(self, chat_id, url=None):
+        """Stop watching url (or everything) for a chat, returning how many were removed"""
+        removed = [w['id'] for w in self.list(chat_id) if url is None or w['url'] == url]
+        for watch_id in removed:
+            del self.watches[watch_id]
+        if removed:
+            self._save()
+        return len(removed)
+    
+    def list(self, chat_id):
+        """Watches belonging to a chat"""
+        return [w for w in self.watches.values() if w['chat_id'] == chat_id]
+    
+    def due(self, now=None):
+        """Watches whose next check time has passed, most overdue first"""
+        now = now or time.time()
+        return sorted((w for w in self.watches.values() if w['next_check'] <= now), key=lambda w: w['next_check'])
+    
+    def check(self, watch):
+        """Blocking single check of a watched URL"""
+        try:
+            start_time = time.time()
+            response = self.session.get(watch['url'], timeout=self.timeout)
+            response_time = time.time() - start_time
+            
+            if response.status_code != 200:
+                state = 'down'
+            elif response_time > watch['latency_threshold']:
+                state = 'slow'
+            else:
+                state = 'up'
+            return {'state': state, 'status_code': response.status_code, 'response_time': response_time}
+        except Exception as e:
+            return {'state': 'down', 'status_code': 0, 'response_time': None, 'error': str(e)}
+    
+    def _apply(self, watch, result, now):
+        """Record a check result; return True when the state changed worth alerting"""
+        previous = watch['state']
+        watch.update({
+            'state': result['state'],
+            'status_code': result['status_code'],
+            'response_time': result['response_time'],
+            'last_check': now,
+            'next_check': now + watch['interval'] * (1 + random.uniform(-self.jitter, self.jitter))
+        })
+        # The first 'up' only sets the baseline
+        return result['state'] != previous and not (previous is None and result['state'] == 'up')
+    
+    async def run_due(self, notify):
+        """Check every due watch in concurrent batches and alert on state changes"""
+        due = self.due()
+        
+        for i in range(0, len(due), self.batch_size):
+            batch = due[i:i + self.batch_size]
+            results = await asyncio.gather(*[asyncio.to_thread(self.check, watch) for watch in batch])
+            now = time.time()
+            
+            for watch, result in zip(batch, results):
+                # Watch may have been removed while the batch was running
+                if watch['id'] not in self.watches:
+                    continue
+                previous = watch['state']
+                if self._apply(watch, result, now):
+                    try:
+                        await notify(watch, previous, result)
+                    except Exception as e:
+                        print(f"Error sending alert for {watch['url']}: {e}")
+        
+        if due:
+            self._save()
+        return len(due)
+    
+    async def run(self, notify):
+        """Scheduler loop; notify(watch, previous_state, result) is awaited on alerts"""
+        while True:
+            try:
+                await self.run_due(notify)
+            except Exception as e:
+                print(f"Monitor error: {e}")
+            await asyncio.sleep(self.tick)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+import io
+import json
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from string import Template
+
+def compile_template(text):
+    """Compile a $placeholder template into a bound str.format, parsed once"""
+    template = Template(text.replace('{', '{{').replace('}', '}}'))
+    names = {match.group('named') for match in template.pattern.finditer(text)} - {None}
+    return template.substitute({name: '{' + name + '}' for name in names}).format
+
+# Templates are compiled once at import; every render only fills in
+# pre-built fragments
+
+TESTER_SCRIPT = compile_template('''#!/usr/bin/env python3
+import requests
+import json
+
+# API Configuration
+url = "$url"
+method = "$method"
+
+headers = $headers
+
+cookies = $cookies
+$body
+# Create session and make request
+session = requests.Session()
+
+try:
+    if method == 'GET':
+        response = session.get(url, headers=headers, cookies=cookies$get_args)
+    elif method == 'POST':
+        response = session.post(url, headers=headers, cookies=cookies$write_args)
+    elif method == 'PUT':
+        response = session.put(url, headers=headers, cookies=cookies$write_args)
+    else:
+        response = session.request(method, url, headers=headers, cookies=cookies)
+
+    print(f"Status Code: {response.status_code}")
+    print(f"URL: {url}")
+    
+    if response.status_code == 200:
+        try:
+            data = response.json()
+            print("✅ SUCCESS - Response JSON:")
+            print(json.dumps(data, indent=2, ensure_ascii=False))
+        except:
+            print("✅ SUCCESS - Response Text:")
+            print(response.text)
+    else:
+        print(f"❌ FAILED - Status: {response.status_code}")
+        print("Response:", response.text)
+
+except Exception as e:
+    print(f"💥 Request failed: {e}")
+
+print("\\n" + "="*50)
+print("API Test Completed!")
+''')
+
+REQUEST_SCRIPT = compile_template('''#!/usr/bin/env python3
+import requests
+import json
+
+# API Request generated by Universal API Tester
+# Generated on: $generated_on
+
+def make_request():
+    url = "$url"
+    method = "$method"
+    
+    headers = $headers
+    $cookies$body
+    response = requests.request(
+        method=method,
+        url=url,
+        headers=headers,$request_args
+        timeout=30
+    )
+    
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {response.text}")
+    
+    return response
+
+if __name__ == "__main__":
+    make_request()
+''')
+
+CURL_COMMAND = compile_template('''curl -X $method \\
+  '$url' \\
+$headers$body  --compressed''')
+
+CURL_HEADER = compile_template('''  -H '$key: $value' \\
+''')
+
+JAVASCRIPT_FETCH = compile_template('''// API Request generated by Universal API Tester
+// Generated on: $generated_on
+
+const url = '$url';
+const method = '$method';
+
+const headers = $headers;
+$body
+fetch(url, {
+    method: method,
+    headers: headers,
+    body: body
+})
+.then(response => response.text())
+.then(data => {
+    console.log('Response:', data);
+})
+.catch(error => {
+    console.error('Error:', error);
+});
+''')
+
+@lru_cache(maxsize=4096)
+def _indented(compact, indent, ensure_ascii):
+    return json.dumps(json.loads(compact), indent=indent, ensure_ascii=ensure_ascii)
+
+def dumps(value, indent, ensure_ascii=True):
+    """json.dumps(value, indent=...) memoised on the compact encoding
+
+    Indented output goes through the pure-Python encoder; captured headers
+    and cookies repeat across endpoints, so re-encoding them is wasted work.
+    """
+    try:
+        compact = json.dumps(value, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return json.dumps(value, indent=indent, ensure_ascii=ensure_ascii)
+    return _indented(compact, indent, ensure_ascii)
+
+def render_tester_script(api_info):
+    """Standalone requests script for a tested API (APITester format)"""
+    method = api_info.get('method')
+    params = api_info.get('params')
+    body = ''
+    get_args = ''
+    write_args = ''
+    
+    if method in ['POST', 'PUT'] and params:
+        body = f"\ndata = {dumps(params, 4, False)}\n"
+        write_args = ", data=data"
+    elif method == 'GET' and params:
+        body = f"\nparams = {dumps(params, 4, False)}\n"
+        get_args = ", params=params"
+    
+    return TESTER_SCRIPT(
+        url=api_info['url'],
+        method=api_info.get('method', 'GET'),
+        headers=dumps(api_info.get('headers', {}), 4, False),
+        cookies=dumps(api_info.get('cookies', {}), 4, False),
+        body=body,
+        get_args=get_args,
+        write_args=write_args
+    )
+
+def render_python_request(request_data, generated_on=None):
+    """requests.request() script (CodeExporter python format)"""
+    request_args = ''
+    
+    if request_data.get('cookies'):
+        cookies = f"\n    cookies = {dumps(request_data.get('cookies', {}), 4)}\n    "
+        request_args += "\n        cookies=cookies,"
+    else:
+        cookies = "\n    cookies = None\n"
+    
+    if request_data.get('json_body'):
+        body = f"\n    json_data = {dumps(request_data.get('json_body', {}), 4)}\n    "
+        request_args += "\n        json=json_data,"
+    elif request_data.get('data'):
+        body = f"\n    data = \"{request_data.get('data')}\"\n    "
+        request_args += "\n        data=data,"
+    else:
+        body = "\n    data = None\n"
+    
+    return REQUEST_SCRIPT(
+        generated_on=generated_on or datetime.now().isoformat(),
+        url=request_data['url'],
+        method=request_data.get('method', 'GET'),
+        headers=dumps(request_data.get('headers', {}), 4),
+        cookies=cookies,
+        body=body,
+        request_args=request_args
+    )
+
+def render_curl(request_data):
+    """cURL command"""
+    headers = ''.join(
+        CURL_HEADER(key=key, value=value)
+        for key, value in request_data.get('headers', {}).items()
+    )
+    
+    if request_data.get('json_body'):
+        body = f"  --data-raw '{json.dumps(request_data['json_body'])}' \\\n"
+    elif request_data.get('data'):
+        body = f"  --data-raw '{request_data['data']}' \\\n"
+    else:
+        body = ''
+    
+    return CURL_COMMAND(
+        method=request_data.get('method', 'GET'),
+        url=request_data['url'],
+        headers=headers,
+        body=body
+    )
+
+def render_javascript(request_data, generated_on=None):
+    """JavaScript fetch() snippet"""
+    if request_data.get('json_body'):
+        body = f"\nconst body = JSON.stringify({dumps(request_data.get('json_body', {}), 2)});\n"
+    else:
+        body = "\nconst body = null;\n"
+    
+    return JAVASCRIPT_FETCH(
+        generated_on=generated_on or datetime.now().isoformat(),
+        url=request_data['url'],
+        method=request_data.get('method', 'GET'),
+        headers=dumps(request_data.get('headers', {}), 2),
+        body=body
+    )
+
+def render_info(api_info):
+    """API info JSON as saved next to exported scripts"""
+    return json.dumps(api_info, indent=2, ensure_ascii=False)
+
+# format -> (file suffix, renderer, takes generated_on)
+FORMATS = {
+    'python': ('.py', render_tester_script, False),
+    'requests': ('_requests.py', render_python_request, True),
+    'curl': ('.sh', render_curl, False),
+    'javascript': ('.js', render_javascript, True),
+    'info': ('_info.json', render_info, False)
+}
+
+def render_api(task):
+    """Render every requested format for one API; top level so worker processes can run it"""
+    index, api_info, formats, generated_on = task
+    files = []
+    for format_name in formats:
+        suffix, renderer, timestamped = FORMATS[format_name]
+        text = renderer(api_info, generated_on) if timestamped else renderer(api_info)
+        files.append((f"api_{index}{suffix}", text))
+    return files
+
+class ExportPipeline:
+    def __init__(self, formats=None, workers=1, chunk_size=256):
+        self.formats = list(formats or FORMATS)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        
+        unknown = [f for f in self.formats if f not in FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported format: {', '.join(unknown)}")
+    
+    def iter_rendered(self, api_infos):
+        """Yield (filename, text) for every format of every API, in order"""
+        generated_on = datetime.now().isoformat()
+        tasks = ((i, api_info, self.formats, generated_on) for i, api_info in enumerate(api_infos, 1))
+        
+        if self.workers > 1:
+            # multiprocessing is slow to import and only needed here
+            from concurrent.futures import ProcessPoolExecutor
+            
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for files in pool.map(render_api, tasks, chunksize=self.chunk_size):
+                    yield from files
+        else:
+            for task in tasks:
+                yield from render_api(task)
+    
+    def export_archive(self, api_infos, output, archive_format='zip', compresslevel=1):
+        """Stream every rendered file straight into a zip or tar.gz archive
+        
+        output is a path or a writable binary file object. compresslevel=0
+        stores zip entries uncompressed, the fastest option; tar.gz
+        compresses the whole stream and gives far smaller archives. Returns
+        counts and timing for the export.
+        """
+        import gzip
+        import tarfile
+        import zipfile
+        
+        start_time = time.time()
+        files = 0
+        total_bytes = 0
+        
+        if archive_format == 'zip':
+            if compresslevel:
+                archive = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+            else:
+                archive = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED)
+            stream = None
+            add = archive.writestr
+        elif archive_format in ('tar', 'tar.gz'):
+            if isinstance(output, (str, os.PathLike)):
+                stream = gzip.open(output, 'wb', compresslevel=compresslevel)
+            else:
+                stream = gzip.GzipFile(fileobj=output, mode='wb', compresslevel=compresslevel)
+            # GNU headers: PAX headers are several times slower to build
+            archive = tarfile.open(fileobj=stream, mode='w|', format=tarfile.GNU_FORMAT)
+            mtime = time.time()
+            
+            def add(name, data):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = mtime
+                archive.addfile(info, io.BytesIO(data))
+        else:
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+        
+        try:
+            with archive:
+                for name, text in self.iter_rendered(api_infos):
+                    data = text.encode('utf-8')
+                    add(name, data)
+                    files += 1
+                    total_bytes += len(data)
+        finally:
+            if stream:
+                stream.close()
+        
+        return {
+            'files': files,
+            'bytes': total_bytes,
+            'elapsed': time.time() - start_time
+        }
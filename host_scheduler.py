@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+from collections import OrderedDict, deque
+from circuit_breaker import host_key
+from run_history import is_critical
+
+# Per-host queues served by deficit round-robin. Each round every host with
+# ready work earns quantum seconds of credit and spends its expected service
+# time (a moving average of its latency) per request it dispatches. Hosts get
+# equal worker time, so a block of slow endpoints on one host cannot hold up
+# the fast hosts queued behind it in the capture. Requests tagged critical
+# jump the round: they go first whenever their host may be served.
+
+class HostScheduler:
+    def __init__(self, rate_limiter=None, concurrency=None, quantum=0.25, default_cost=0.1, smoothing=0.3):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.quantum = quantum
+        self.default_cost = default_cost
+        self.smoothing = smoothing
+        self.queues = OrderedDict()
+        self.deficits = {}
+        self.costs = {}
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def push(self, api):
+        host = host_key(api['url'])
+        if host not in self.queues:
+            self.queues[host] = deque()
+            self.deficits[host] = 0.0
+        self.queues[host].append(api)
+        self.size += 1
+    
+    def record(self, url, seconds):
+        """Fold a finished request's time into its host's expected cost"""
+        host = host_key(url)
+        cost = self.costs.get(host)
+        self.costs[host] = seconds if cost is None else cost + self.smoothing * (seconds - cost)
+    
+    def cost(self, host):
+        return self.costs.get(host, self.default_cost)
+    
+    def below_limit(self, host):
+        """Whether host has room under its concurrency limit"""
+        return not self.concurrency or self.concurrency.get(self.queues[host][0]['url']).available()
+    
+    def ready_hosts(self):
+        """Hosts with queued work, room under their concurrency limit and no rate limit delay"""
+        return [
+            host for host in self.queues
+            if self.below_limit(host)
+            and (not self.rate_limiter or not self.rate_limiter.delay(self.queues[host][0]['url']))
+        ]
+    
+    def pop_ready(self):
+        """Next request by deficit round-robin among hosts that may be served now, or None"""
+        ready = self.ready_hosts()
+        if not ready:
+            return None
+        ready = [host for host in ready if is_critical(self.queues[host][0])] or ready
+        
+        host = next((h for h in ready if self.deficits[h] >= self.cost(h)), None)
+        if host is None:
+            # Run as many rounds as it takes for some ready host to afford a request
+            rounds = min(-(-(self.cost(h) - self.deficits[h]) // self.quantum) for h in ready)
+            for h in ready:
+                self.deficits[h] += rounds * self.quantum
+            host = min(ready, key=lambda h: self.cost(h) - self.deficits[h])
+        
+        self.deficits[host] -= self.cost(host)
+        if self.deficits[host] < self.cost(host):
+            # Credit spent: go to the back of the round
+            self.queues.move_to_end(host)
+        return self._pop(host)
+    
+    def _pop(self, host):
+        queue = self.queues[host]
+        api = queue.popleft()
+        if not queue:
+            # An idle host does not bank credit
+            del self.queues[host]
+            del self.deficits[host]
+        self.size -= 1
+        return api
+    
+    def drain(self):
+        """Remove and return everything still queued"""
+        apis = [api for queue in self.queues.values() for api in queue]
+        self.queues.clear()
+        self.deficits.clear()
+        self.size = 0
+        return apis
+    
+    def next_ready_in(self):
+        """Seconds until some throttled host may be served again
+        
+        None when every waiting host is at its concurrency limit - only a
+        finishing request can free one up then.
+        """
+        hosts = [host for host in self.queues if self.below_limit(host)]
+        if not hosts:
+            return None
+        if not self.rate_limiter:
+            return 0
+        return min(self.rate_limiter.delay(self.queues[host][0]['url']) for host in hosts)
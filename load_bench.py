@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from api_tester import APITester
+from retry_policy import RetryPolicy
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not values:
+        return 0
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def render_histogram(values, bins=8, width=20):
+    """Render latencies (seconds) as a text histogram, one line per bucket"""
+    if not values:
+        return 'no samples'
+    
+    low, high = min(values), max(values)
+    step = (high - low) / bins or 1
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / step), bins - 1)] += 1
+    
+    peak = max(counts)
+    labels = [f"{(low + i * step) * 1000:.0f}-{(low + (i + 1) * step) * 1000:.0f}ms" for i in range(bins)]
+    label_width = max(len(label) for label in labels)
+    
+    lines = []
+    for label, count in zip(labels, counts):
+        bar = '█' * round(count / peak * width)
+        lines.append(f"{label:>{label_width}} |{bar:<{width}}| {count}")
+    return '\n'.join(lines)
+
+def run_benchmark(url, method='GET', count=50, concurrency=5, progress=None, tester=None):
+    """Fire count requests at url with the given concurrency through APITester
+    
+    progress(done, total, latencies, errors) is called from the worker
+    threads after every completed request.
+    """
+    # Retries would hide the errors and distort the latencies being measured
+    tester = tester or APITester(retry_policy=RetryPolicy(max_attempts=1))
+    api_info = {'url': url, 'method': method, 'headers': {}, 'cookies': {}}
+    latencies = []
+    errors = 0
+    status_codes = Counter()
+    
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(tester.test_api_endpoint, dict(api_info)) for _ in range(count)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            status_codes[result['status_code']] += 1
+            if result['status_code']:
+                latencies.append(result['response_time'])
+            if not result['success']:
+                errors += 1
+            if progress:
+                progress(done, count, latencies, errors)
+    elapsed = time.time() - start_time
+    
+    latencies.sort()
+    return {
+        'url': url,
+        'method': method,
+        'count': count,
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'requests_per_second': count / elapsed if elapsed else 0,
+        'errors': errors,
+        'status_codes': dict(status_codes),
+        'latencies': latencies,
+        'min': latencies[0] if latencies else 0,
+        'mean': sum(latencies) / len(latencies) if latencies else 0,
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'max': latencies[-1] if latencies else 0
+    }
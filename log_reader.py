@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+TIMESTAMP_RE = re.compile(r'(?:Timestamp:\s*)?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})')
+
+def parse_since(text, now=None):
+    """Parse '30m', '2h', '1d' (relative) or an ISO date/time into a datetime"""
+    match = re.fullmatch(r'(\d+)\s*([smhd])', text.strip().lower())
+    if match:
+        seconds = int(match.group(1)) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+        return (now or datetime.now()) - timedelta(seconds=seconds)
+    try:
+        return to_local_naive(datetime.fromisoformat(text.strip()))
+    except ValueError:
+        raise ValueError(f"Invalid time: {text} (use 30m, 2h, 1d or 2024-01-31T12:00)")
+
+def to_local_naive(moment):
+    """Log timestamps are naive local time; bring aware datetimes to the same footing"""
+    if moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
+
+def parse_line_timestamp(line):
+    """Timestamp at the start of a log line, or None for continuation lines"""
+    match = TIMESTAMP_RE.match(line)
+    if not match:
+        return None
+    try:
+        return to_local_naive(datetime.fromisoformat(match.group(1).replace(' ', 'T')))
+    except ValueError:
+        return None
+
+def iter_lines_reversed(path, block_size=64 * 1024):
+    """Yield the lines of a file last to first, reading blocks from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        if not position:
+            return
+        
+        # A final newline ends the last line rather than starting an empty one
+        f.seek(position - 1)
+        if f.read(1) == b'\n':
+            position -= 1
+        remainder = b''
+        
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # First piece may be a partial line; keep it for the next block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode('utf-8', errors='replace')
+        
+        yield remainder.decode('utf-8', errors='replace')
+
+def select_lines(path, tail=None, since=None, pattern=None):
+    """Last `tail` lines newer than `since` matching `pattern`, in file order
+    
+    Only the end of the file that is actually needed is read. With since,
+    continuation lines are kept or dropped together with their head line.
+    """
+    regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+    since = to_local_naive(since) if since else None
+    selected = []
+    # Continuation lines read since the last timestamped line (reading backwards)
+    record = []
+    
+    def keep(lines):
+        """Add lines to the selection; True once tail is reached"""
+        for line in lines:
+            if regex and not regex.search(line):
+                continue
+            selected.append(line)
+            if tail and len(selected) >= tail:
+                return True
+        return False
+    
+    for line in iter_lines_reversed(path):
+        if not since:
+            if keep([line]):
+                break
+            continue
+        
+        timestamp = parse_line_timestamp(line)
+        if timestamp is None:
+            record.append(line)
+            continue
+        if timestamp < since:
+            # The pending continuation lines belong to this older record
+            record = []
+            break
+        full = keep(record + [line])
+        record = []
+        if full:
+            break
+    else:
+        # Lines before the first timestamp in the file have no known age
+        keep(record)
+    
+    selected.reverse()
+    return selected
+
+def prepare_log(path, tail=None, since=None, pattern=None, gzip_threshold=1024 * 1024):
+    """Get the requested part of a log ready for upload
+    
+    Returns a dict with the file to send and its upload name. Output above
+    gzip_threshold bytes is streamed through gzip into a temporary file; when
+    'temporary' is set the caller removes it after uploading.
+    """
+    name = os.path.basename(path)
+    
+    if tail is None and since is None and pattern is None:
+        size = os.path.getsize(path)
+        if size <= gzip_threshold:
+            return {'path': path, 'filename': name, 'size': size, 'lines': None, 'temporary': False}
+        source = open(path, 'rb')
+        line_count = None
+    else:
+        lines = select_lines(path, tail, since, pattern)
+        data = ('\n'.join(lines) + '\n' if lines else '').encode('utf-8')
+        size = len(data)
+        source = tempfile.SpooledTemporaryFile(max_size=gzip_threshold)
+        source.write(data)
+        source.seek(0)
+        line_count = len(lines)
+    
+    with source:
+        if size > gzip_threshold:
+            name += '.gz'
+            fd, temp_path = tempfile.mkstemp(suffix='.gz')
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(filename=os.path.basename(path), mode='wb', fileobj=raw) as out:
+                shutil.copyfileobj(source, out, 1024 * 1024)
+        else:
+            fd, temp_path = tempfile.mkstemp()
+            with os.fdopen(fd, 'wb') as out:
+                shutil.copyfileobj(source, out)
+    
+    return {'path': temp_path, 'filename': name, 'size': size, 'lines': line_count, 'temporary': True}
@@ -7,16 +7,29 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from devtools_parser import AdvancedDevToolsParser
-from advanced_login import UniversalLoginSystem
 from api_tester import APITester
+from code_exporter import CodeExporter
+from export_pipeline import ExportPipeline
+from checkpoint import RunCheckpoint
+
+CHECKPOINT_FILE = 'test_checkpoint.jsonl'
 
 class UniversalAPITester:
     def __init__(self):
         self.parser = AdvancedDevToolsParser()
-        self.login_system = UniversalLoginSystem()
+        self._login_system = None
         self.tester = APITester()
+        self.exporter = CodeExporter()
         self.config = {}
     
+    @property
+    def login_system(self):
+        """Login system, imported on first use since it pulls in BeautifulSoup"""
+        if self._login_system is None:
+            from advanced_login import UniversalLoginSystem
+            self._login_system = UniversalLoginSystem()
+        return self._login_system
+    
     def clear_screen(self):
         os.system('clear' if os.name == 'posix' else 'cls')
     
@@ -126,7 +139,7 @@ class UniversalAPITester:
             return
         
         print(f"\n🔄 Attempting login...")
-        login_result = self.login_system.perform_login(
+        login_result = self.login_system.get_session(
             login_api['url'], 
             username, 
             password, 
@@ -135,7 +148,11 @@ class UniversalAPITester:
         
         if login_result['success']:
             print("✅ Login successful! Testing APIs...")
-            self.test_apis(data_apis, login_result['cookies'])
+            # A fresh login that gets 401/403 is not an expired session - only retry pooled ones
+            relogin = None
+            if login_result.get('reused'):
+                relogin = lambda: self.login_system.relogin(login_api['url'], username, password, base_url)
+            self.test_apis(data_apis, login_result['cookies'], relogin)
         else:
             print(f"❌ Login failed: {login_result.get('error', 'Unknown error')}")
     
@@ -168,27 +185,82 @@ class UniversalAPITester:
             base_url = input("Base URL (optional): ").strip()
         
         print(f"\n🔄 Attempting login...")
-        login_result = self.login_system.perform_login(login_url, username, password, base_url)
+        login_result = self.login_system.get_session(login_url, username, password, base_url)
         
         if login_result['success']:
             print("✅ Login successful! Testing APIs...")
-            self.test_apis(data_apis, login_result['cookies'])
+            # A fresh login that gets 401/403 is not an expired session - only retry pooled ones
+            relogin = None
+            if login_result.get('reused'):
+                relogin = lambda: self.login_system.relogin(login_url, username, password, base_url)
+            self.test_apis(data_apis, login_result['cookies'], relogin)
         else:
             print(f"❌ Login failed: {login_result.get('error', 'Unknown error')}")
     
-    def test_apis(self, apis, auth_cookies=None):
-        """Test a list of APIs"""
+    def test_apis(self, apis, auth_cookies=None, relogin=None):
+        """Test a list of APIs
+        
+        relogin is called when an endpoint answers 401/403 so an expired
+        pooled session is replaced and the endpoint retried once. Finished
+        endpoints are journaled so an interrupted run can be resumed.
+        """
         if not apis:
             print("❌ No APIs to test")
             return
         
-        print(f"\n🧪 TESTING {len(apis)} APIS...")
+        unique_apis, groups = self.parser.deduplicate_requests(apis)
+        
+        checkpoint = RunCheckpoint(CHECKPOINT_FILE)
+        run_id = checkpoint.make_run_id(groups)
+        finished = checkpoint.load(run_id)
+        resume = False
+        if finished:
+            answer = input(f"\n♻️ A previous run stopped after {finished}/{len(unique_apis)} APIs. Resume it? (Y/n): ")
+            resume = answer.strip().lower() != 'n'
+        checkpoint.open(run_id, resume)
+        
+        print(f"\n🧪 TESTING {len(unique_apis)} APIS...")
         print("=" * 50)
+        if resume:
+            print(f"♻️ Skipping {finished} APIs already tested")
         
-        for i, api in enumerate(apis, 1):
-            print(f"\n[{i}/{len(apis)}] ", end="")
-            self.tester.test_api_endpoint(api, auth_cookies)
+        try:
+            for i, api in enumerate(unique_apis, 1):
+                stored = checkpoint.completed.get(api['fingerprint'])
+                if stored is not None:
+                    result = self.tester.restore_result(stored, api)
+                else:
+                    print(f"\n[{i}/{len(unique_apis)}] ", end="")
+                    result = self.tester.test_api_endpoint(api, auth_cookies)
+                    
+                    if relogin and result['status_code'] in (401, 403):
+                        login_result = relogin()
+                        if login_result['success']:
+                            self.tester.discard_result(result)
+                            auth_cookies = login_result['cookies']
+                            result = self.tester.test_api_endpoint(api, auth_cookies)
+
+                            # A fresh session was rejected too - the endpoint itself is forbidden
+                            if result['status_code'] in (401, 403):
+                                relogin = None
+                        else:
+                            print(f"❌ Re-login failed: {login_result.get('error', 'Unknown error')}")
+                            relogin = None
+                    
+                    # Skipped endpoints are retried when the run is resumed
+                    if not result.get('skipped'):
+                        checkpoint.record(api['fingerprint'], result)
+                
+                # Same fingerprint means same answer - reuse it for every duplicate
+                for duplicate in groups[api['fingerprint']][1:]:
+                    self.tester.record_duplicate(result, duplicate)
+        except KeyboardInterrupt:
+            checkpoint.close()
+            print(f"\n⏸️ Interrupted - {len(checkpoint.completed)} results saved to '{CHECKPOINT_FILE}'")
+            print("🔁 Test the same data again to resume")
+            return
         
+        checkpoint.close(remove=True)
         self.show_test_results()
     
     def show_test_results(self):
@@ -200,15 +272,30 @@ class UniversalAPITester:
         print(f"✅ Successful: {stats['successful']}")
         print(f"❌ Failed: {stats['failed']}")
         print(f"📈 Success Rate: {stats['success_rate']:.1f}%")
+        if stats['duplicates']:
+            print(f"🧬 Deduplicated: {stats['duplicates']} of {stats['total_tested']} requests "
+                  f"({stats['dedup_ratio']:.1f}%), {stats['unique_tested']} actually sent")
+        if stats['retries'] or stats['retry_budget']['denied']:
+            print(f"🔁 Retries: {stats['retries']} ({stats['retry_budget']['denied']} refused by the retry budget)")
+        if stats['skipped']:
+            print(f"⏭️ Untested: {stats['skipped']} (host unreachable or deadline reached)")
+        for host, limit in stats['rate_limits'].items():
+            if limit['throttled']:
+                print(f"⏳ {host}: throttled {limit['throttled']:.1f}s by rate limits ({limit['pauses']} pauses)")
+        for host, breaker in stats['circuit_breakers'].items():
+            print(f"🔌 {host}: circuit {breaker['state']}, tripped {breaker['trips']}x, "
+                  f"{breaker['skipped']} skipped - {breaker['last_error']}")
         
         if stats['successful'] > 0:
             print(f"\n💾 EXPORT OPTIONS:")
             print("1. View Python Codes")
             print("2. Save All Codes to Files")
             print("3. View Detailed Results")
-            print("4. Back to Menu")
+            print("4. Export Async Client Module")
+            print("5. Export Load Test Scenarios (Locust + k6)")
+            print("6. Back to Menu")
             
-            choice = input("\nSelect option (1-4): ").strip()
+            choice = input("\nSelect option (1-6): ").strip()
             
             if choice == '1':
                 self.view_python_codes()
@@ -216,6 +303,10 @@ class UniversalAPITester:
                 self.save_all_codes()
             elif choice == '3':
                 self.view_detailed_results()
+            elif choice == '4':
+                self.save_async_client()
+            elif choice == '5':
+                self.save_load_tests()
     
     def view_python_codes(self):
         """View generated Python codes"""
@@ -232,11 +323,35 @@ class UniversalAPITester:
     
     def save_all_codes(self):
         """Save all codes to files"""
-        exported = self.tester.export_all_codes()
+        print("\n1. One script per API (api_N.py + api_N_info.json)")
+        print("2. Single importable client module (api_client.py)")
+        print("3. Every format for every API in one archive (api_codes.zip)")
+        mode = input("\nSelect export mode [1]: ").strip() or '1'
         
         # Create directory
         os.makedirs('exported_codes', exist_ok=True)
         
+        if mode == '2':
+            apis = [result['api_info'] for result in self.tester.working_apis]
+            with open('exported_codes/api_client.py', 'w', encoding='utf-8') as f:
+                f.write(self.exporter.export_sdk_module(apis))
+            
+            print(f"✅ Client module with {len(apis)} endpoint functions saved to 'exported_codes/api_client.py'")
+            input("Press Enter to continue...")
+            return
+        
+        if mode == '3':
+            apis = [result['api_info'] for result in self.tester.working_apis]
+            workers = (os.cpu_count() or 1) if len(apis) >= 1000 else 1
+            stats = ExportPipeline(workers=workers).export_archive(apis, 'exported_codes/api_codes.zip')
+            
+            print(f"✅ {stats['files']} files for {len(apis)} APIs saved to 'exported_codes/api_codes.zip'")
+            print(f"⏱️ Rendered {stats['bytes'] / 1024:.0f} KiB in {stats['elapsed']:.2f}s")
+            input("Press Enter to continue...")
+            return
+        
+        exported = self.tester.export_all_codes()
+        
         for name, data in exported.items():
             # Save Python code
             with open(f'exported_codes/{name}.py', 'w', encoding='utf-8') as f:
@@ -250,6 +365,40 @@ class UniversalAPITester:
         print(f"📁 {len(exported)} Python files created")
         input("Press Enter to continue...")
     
+    def save_async_client(self):
+        """Save one asyncio client module driving every working API"""
+        concurrency = input("Max concurrent requests [50]: ").strip()
+        # Semaphore(0) would deadlock the generated client
+        concurrency = int(concurrency) if concurrency.isdigit() and int(concurrency) > 0 else 50
+        
+        apis = [result['api_info'] for result in self.tester.working_apis]
+        code = self.exporter.export_async_client(apis, concurrency=concurrency)
+        
+        os.makedirs('exported_codes', exist_ok=True)
+        with open('exported_codes/async_client.py', 'w', encoding='utf-8') as f:
+            f.write(code)
+        
+        print(f"✅ Async client for {len(apis)} APIs saved to 'exported_codes/async_client.py'")
+        print("🚀 Run it with: python exported_codes/async_client.py <requests> [concurrency]")
+        input("Press Enter to continue...")
+    
+    def save_load_tests(self):
+        """Save Locust and k6 scenarios weighted by captured call frequency"""
+        profile = self.tester.get_load_profile()
+        
+        os.makedirs('exported_codes', exist_ok=True)
+        with open('exported_codes/locustfile.py', 'w', encoding='utf-8') as f:
+            f.write(self.exporter.export_locust_file(profile))
+        with open('exported_codes/k6_script.js', 'w', encoding='utf-8') as f:
+            f.write(self.exporter.export_k6_script(profile))
+        
+        print(f"✅ Load test scenarios for {len(profile)} APIs saved:")
+        print("   📄 exported_codes/locustfile.py")
+        print("   📄 exported_codes/k6_script.js")
+        for entry in profile:
+            print(f"   ⚖️ weight {entry['weight']}: {entry['api_info'].get('method', 'GET')} {entry['api_info']['url']}")
+        input("Press Enter to continue...")
+    
     def view_detailed_results(self):
         """View detailed testing results"""
         print(f"\n📋 DETAILED RESULTS")
@@ -307,7 +456,13 @@ class UniversalAPITester:
             print("❌ URL required")
             return
         
-        method = input("Method [GET]: ").strip().upper() or "GET"
+        method = input("Method [GET, AUTO to detect]: ").strip().upper() or "GET"
+        if method == 'AUTO':
+            from multi_method_tester import MultiMethodTester
+            
+            print(f"\n🔍 Detecting the method for {url}...")
+            method_tester = MultiMethodTester()
+            method = method_tester.find_working_method(method_tester.discover_method(url)) or 'GET'
         
         api_info = {
             'url': url,
@@ -357,7 +512,7 @@ class UniversalAPITester:
             return
         
         print(f"\n🔄 Attempting login...")
-        login_result = self.login_system.perform_login(login_url, username, password, base_url)
+        login_result = self.login_system.get_session(login_url, username, password, base_url)
         
         if login_result['success']:
             print("✅ Login successful!")
@@ -433,6 +588,11 @@ class UniversalAPITester:
         input("\nPress Enter to continue...")
 
 def main():
+    # Non-interactive pipeline mode: main.py run --input capture.har ...
+    if len(sys.argv) > 1 and sys.argv[1] == 'run':
+        from batch_runner import run_cli
+        sys.exit(run_cli(sys.argv[2:]))
+    
     tester = UniversalAPITester()
     tester.main_menu()
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import time
+import threading
+from urllib.parse import urlparse
+
+class MethodCache:
+    def __init__(self, cache_file='method_cache.json', ttl=7 * 24 * 3600):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = self._load()
+    
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save(self):
+        try:
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"Error saving method cache: {e}")
+    
+    def url_template(self, url):
+        """Collapse ids in the path so /users/42 and /users/43 share an entry"""
+        parsed = urlparse(url)
+        segments = []
+        for segment in parsed.path.split('/'):
+            if re.fullmatch(r'\d+', segment) or \
+               re.fullmatch(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}', segment) or \
+               re.fullmatch(r'[0-9a-fA-F]{16,}', segment):
+                segments.append('{id}')
+            else:
+                segments.append(segment)
+        return f"{parsed.netloc.lower()}{'/'.join(segments) or '/'}"
+    
+    def get(self, url):
+        """Return the cached method for a URL, or None if unknown or expired"""
+        key = self.url_template(url)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            if time.time() - entry['cached_at'] > self.ttl:
+                del self.entries[key]
+                self._save()
+                return None
+            return entry['method']
+    
+    def put(self, url, method, response_time=0):
+        """Remember the method that worked for a URL template"""
+        with self.lock:
+            self.entries[self.url_template(url)] = {
+                'method': method,
+                'response_time': response_time,
+                'cached_at': time.time()
+            }
+            self._save()
+    
+    def invalidate(self, url):
+        """Forget a cached method that has stopped working"""
+        with self.lock:
+            if self.entries.pop(self.url_template(url), None):
+                self._save()
+                return True
+        return False
+    
+    def clear(self):
+        """Remove every cached entry"""
+        with self.lock:
+            self.entries = {}
+            self._save()
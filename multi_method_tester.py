@@ -2,55 +2,70 @@
 import requests
 import json
 import time
+from method_cache import MethodCache
+
+# Methods that do not change server state and may be probed blindly
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+# Allowed methods that say nothing about which one returns the data
+NON_PROBE_METHODS = {'OPTIONS', 'HEAD', 'TRACE', 'CONNECT'}
 
 class MultiMethodTester:
-    def __init__(self):
+    def __init__(self, method_cache=None):
         self.methods = ['GET', 'POST', 'PUT', 'DELETE']
         self.session = requests.Session()
+        self.last_preflight = None
+        self.method_cache = method_cache if method_cache is not None else MethodCache()
+    
+    def build_request_kwargs(self, auth_data=None, custom_headers=None, timeout=10):
+        """Build request arguments without mutating the caller's headers"""
+        request_kwargs = {'timeout': timeout}
+        headers = dict(custom_headers or {})
+        
+        # Add authentication if available
+        if auth_data:
+            if 'cookies' in auth_data:
+                request_kwargs['cookies'] = auth_data['cookies']
+            if 'headers' in auth_data:
+                headers.update(auth_data['headers'])
+        
+        if headers:
+            request_kwargs['headers'] = headers
+        
+        return request_kwargs
     
     def test_all_methods(self, url, auth_data=None, custom_headers=None):
         """Try all HTTP methods to find working one"""
+        request_kwargs = self.build_request_kwargs(auth_data, custom_headers)
+        results = self.try_cached_method(url, request_kwargs)
+        if results:
+            return results
         results = {}
         
         for method in self.methods:
             try:
                 print(f"🔄 Trying {method} request...")
                 
-                request_kwargs = {
-                    'url': url,
-                    'timeout': 10
-                }
-                
-                # Add authentication if available
-                if auth_data:
-                    if 'cookies' in auth_data:
-                        request_kwargs['cookies'] = auth_data['cookies']
-                    if 'headers' in auth_data:
-                        if custom_headers:
-                            custom_headers.update(auth_data['headers'])
-                        else:
-                            custom_headers = auth_data['headers']
-                
-                if custom_headers:
-                    request_kwargs['headers'] = custom_headers
-                
                 # Make request
-                response = self.session.request(method, **request_kwargs)
+                start_time = time.time()
+                response = self.session.request(method, url, **request_kwargs)
+                response_time = time.time() - start_time
                 
                 results[method] = {
                     'status_code': response.status_code,
                     'success': response.status_code == 200,
-                    'response_time': 0,  # Would calculate in real implementation
+                    'response_time': response_time,
                     'headers': dict(response.headers),
                     'response_preview': self.get_response_preview(response)
                 }
                 
                 if response.status_code == 200:
                     print(f"✅ {method} successful!")
+                    self.method_cache.put(url, method, response_time)
                     break
                 else:
                     print(f"❌ {method} failed: {response.status_code}")
-                    
+            
             except Exception as e:
                 results[method] = {
                     'success': False,
@@ -60,6 +75,122 @@ class MultiMethodTester:
         
         return results
     
+    def try_cached_method(self, url, request_kwargs):
+        """Send the cached known-good method first; drop the entry if it fails"""
+        method = self.method_cache.get(url)
+        if not method:
+            return None
+        
+        print(f"⚡ Using cached method {method}")
+        try:
+            result = self._probe_method(method, url, request_kwargs)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        
+        if result['success']:
+            result['cached'] = True
+            return {method: result}
+        
+        print(f"♻️ Cached method {method} stopped working, rediscovering...")
+        self.method_cache.invalidate(url)
+        return None
+    
+    def discover_allowed_methods(self, url, request_kwargs):
+        """Ask the server which methods it allows via OPTIONS, falling back to HEAD
+        
+        Returns the candidate methods to probe - the usual ones plus any other
+        the server allows, like PATCH - or all methods when the server does not
+        advertise an Allow header.
+        """
+        self.last_preflight = None
+        
+        for method in ['OPTIONS', 'HEAD']:
+            try:
+                start_time = time.time()
+                response = self.session.request(method, url, **request_kwargs)
+                response_time = time.time() - start_time
+            except Exception as e:
+                print(f"⚠️ {method} preflight error: {e}")
+                continue
+            
+            allow = response.headers.get('Allow') or response.headers.get('Access-Control-Allow-Methods')
+            if not allow:
+                continue
+            
+            allowed = [m.strip().upper() for m in allow.split(',') if m.strip()]
+            self.last_preflight = {
+                'method': method,
+                'status_code': response.status_code,
+                'response_time': response_time,
+                'allow': allowed
+            }
+            
+            candidates = [m for m in self.methods if m in allowed] + \
+                         [m for m in allowed if m not in self.methods and m not in NON_PROBE_METHODS]
+            if candidates:
+                print(f"📋 {method} reports allowed methods: {', '.join(allowed)}")
+                return candidates
+        
+        return list(self.methods)
+    
+    def _probe_method(self, method, url, request_kwargs):
+        """Send a single probe"""
+        start_time = time.time()
+        response = self.session.request(method, url, **request_kwargs)
+        response_time = time.time() - start_time
+        
+        return {
+            'status_code': response.status_code,
+            'success': response.status_code == 200,
+            'response_time': response_time,
+            'headers': dict(response.headers),
+            'response_preview': self.get_response_preview(response)
+        }
+    
+    def discover_method(self, url, auth_data=None, custom_headers=None):
+        """Find the working method: OPTIONS/HEAD first, then probes
+        
+        GET is probed first. Unsafe methods can change server state, so they
+        are only sent when the Allow header lists them, one at a time, after
+        GET has failed. Methods that were not sent are marked skipped.
+        """
+        request_kwargs = self.build_request_kwargs(auth_data, custom_headers)
+        results = self.try_cached_method(url, request_kwargs)
+        if results:
+            return results
+        
+        candidates = self.discover_allowed_methods(url, request_kwargs)
+        allowed = self.last_preflight['allow'] if self.last_preflight else []
+        probes = [m for m in candidates if m in SAFE_METHODS] + \
+                 [m for m in candidates if m not in SAFE_METHODS and m in allowed]
+        
+        results = {}
+        for method in probes:
+            print(f"🔄 Trying {method} request...")
+            results[method] = self._probe_logged(url, method, request_kwargs)
+            if results[method].get('success'):
+                break
+        
+        for method in candidates:
+            results.setdefault(method, {'success': False, 'skipped': True})
+        
+        return results
+    
+    def _probe_logged(self, url, method, request_kwargs):
+        """Probe one method, report the outcome and cache it if it worked"""
+        try:
+            result = self._probe_method(method, url, request_kwargs)
+        except Exception as e:
+            print(f"❌ {method} error: {e}")
+            return {'success': False, 'error': str(e)}
+        
+        if result['success']:
+            print(f"✅ {method} successful! ({result['response_time']:.2f}s)")
+            self.method_cache.put(url, method, result['response_time'])
+        else:
+            print(f"❌ {method} failed: {result['status_code']}")
+        return result
+    
     def get_response_preview(self, response):
         """Get preview of response content"""
         try:
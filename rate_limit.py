@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from circuit_breaker import host_key
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_take(self, tokens=1):
+        """Take tokens if available; otherwise return the seconds until they are"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+    
+    def wait_time(self, tokens=1):
+        """Seconds until tokens are available, without taking them"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                return 0
+            return (tokens - self.tokens) / self.rate
+    
+    def sync(self, tokens, rate, capacity):
+        """Adopt the server's view of the quota"""
+        with self.lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = capacity
+            self.tokens = min(tokens, capacity)
+
+def parse_retry_after(value):
+    """Retry-After as seconds from now; it may be delta seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def parse_reset(value):
+    """X-RateLimit-Reset as seconds from now; large values are epoch timestamps"""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+class HostLimit:
+    def __init__(self):
+        self.bucket = None
+        self.paused_until = 0
+        self.pauses = 0
+        self.throttled = 0.0
+        self.blocked_since = None
+        self.remaining = None
+        self.limit = None
+
+class HostRateLimiter:
+    def __init__(self, default_pause=1.0, max_pause=300):
+        self.default_pause = default_pause
+        self.max_pause = max_pause
+        self.hosts = {}
+        self.lock = threading.Lock()
+    
+    def _host(self, url):
+        host = host_key(url)
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostLimit()
+            return self.hosts[host]
+    
+    def _delay(self, limit, take=False):
+        """Seconds the host must still wait; tracks how long it has been blocked"""
+        now = time.monotonic()
+        delay = limit.paused_until - now
+        if delay <= 0 and limit.bucket:
+            delay = limit.bucket.try_take() if take else limit.bucket.wait_time()
+        
+        with self.lock:
+            if delay > 0:
+                if limit.blocked_since is None:
+                    limit.blocked_since = now
+            elif limit.blocked_since is not None:
+                limit.throttled += now - limit.blocked_since
+                limit.blocked_since = None
+        return max(0, delay)
+    
+    def delay(self, url):
+        """Seconds until a request to url's host may go out (0 = now)"""
+        return self._delay(self._host(url))
+    
+    def acquire(self, url):
+        """Block until url's host may be sent another request"""
+        limit = self._host(url)
+        while True:
+            delay = self._delay(limit, take=True)
+            if not delay:
+                return
+            time.sleep(delay)
+    
+    def update(self, url, response):
+        """Learn the host's limits from a response's rate limit headers"""
+        headers = response.headers
+        limit = self._host(url)
+        now = time.monotonic()
+        
+        pause = None
+        if response.status_code in (429, 503):
+            pause = parse_retry_after(headers.get('Retry-After'))
+            if pause is None and response.status_code == 429:
+                pause = self.default_pause
+        
+        remaining = headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))
+        reset = parse_reset(headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset')))
+        quota = headers.get('X-RateLimit-Limit', headers.get('RateLimit-Limit'))
+        try:
+            remaining = int(float(remaining)) if remaining is not None else None
+            # RateLimit-Limit may carry a policy: "100, 100;w=60"
+            quota = int(float(quota.split(',')[0])) if quota else None
+        except ValueError:
+            remaining = None
+        
+        with self.lock:
+            if remaining is not None and reset is not None:
+                limit.remaining = remaining
+                limit.limit = quota or max(limit.limit or 0, remaining)
+                if remaining <= 0:
+                    pause = max(pause or 0, reset)
+                else:
+                    # Burst through what is left, then refill a full window per reset period
+                    rate = max(limit.limit, 1) / max(reset, 1)
+                    if limit.bucket is None:
+                        limit.bucket = TokenBucket(rate, limit.limit)
+                    limit.bucket.sync(remaining, rate, max(limit.limit, 1))
+            
+            if pause:
+                pause = min(pause, self.max_pause)
+                if now + pause > limit.paused_until:
+                    limit.paused_until = now + pause
+                    limit.pauses += 1
+                    print(f"⏳ Rate limited by {host_key(url)}, pausing it for {pause:.1f}s")
+    
+    def summary(self):
+        """Throttling per host, for every host that was ever held back or sent limits"""
+        now = time.monotonic()
+        with self.lock:
+            hosts = list(self.hosts.items())
+        
+        summary = {}
+        for host, limit in hosts:
+            throttled = limit.throttled + (now - limit.blocked_since if limit.blocked_since is not None else 0)
+            if throttled or limit.pauses or limit.remaining is not None:
+                summary[host] = {
+                    'throttled': round(throttled, 3),
+                    'pauses': limit.pauses,
+                    'remaining': limit.remaining,
+                    'limit': limit.limit
+                }
+        return summary
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import random
+import threading
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'}
+
+# Transient answers worth another attempt
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Statuses that mean the server refused the request before acting on it,
+# so even a POST can be sent again
+REJECTED_STATUSES = {429, 503}
+
+class RetryBudget:
+    def __init__(self, ratio=0.1, min_retries=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self.lock = threading.Lock()
+    
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+    
+    def try_spend(self):
+        """Claim one retry if retries stay within ratio of all requests sent"""
+        with self.lock:
+            if self.retries < self.min_retries + self.ratio * self.requests:
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+    
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'denied': self.denied
+            }
+
+def never_sent(error):
+    """True when the connection failed before any of the request went out"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    # NewConnectionError (refused, DNS failure) is a ConnectTimeoutError subclass
+    return isinstance(reason, ConnectTimeoutError)
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8, retry_statuses=None,
+                 retry_non_idempotent=False, budget=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses) if retry_statuses is not None else set(RETRY_STATUSES)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.budget = budget if budget is not None else RetryBudget()
+    
+    def is_retryable(self, method, response=None, error=None):
+        """Whether this outcome may be retried for method, ignoring attempts and budget
+        
+        Idempotent methods retry on any transient status, connection error
+        or timeout. POST/PATCH only retry when the server cannot have acted:
+        the connection never opened, or it answered 429/503.
+        """
+        safe = self.retry_non_idempotent or method in IDEMPOTENT_METHODS
+        
+        if response is not None:
+            if response.status_code not in self.retry_statuses:
+                return False
+            return safe or response.status_code in REJECTED_STATUSES
+        
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return safe or never_sent(error)
+        return False
+    
+    def should_retry(self, method, attempt, response=None, error=None):
+        """Decide after attempt (0-based) whether to go again; spends budget when yes"""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if not self.is_retryable(method, response, error):
+            return False
+        return self.budget.try_spend()
+    
+    def backoff(self, attempt):
+        """Full jitter: uniform over [0, min(max_delay, base * 2^attempt)]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
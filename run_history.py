@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import csv
+import json
+import heapq
+from collections import deque
+
+# Latency of each endpoint in earlier runs, read back from the results files
+# the batch runner writes (jsonl or csv) or a DataManager data.json. Used to
+# start the historically slowest endpoints first: with a fixed worker count,
+# longest-expected-first keeps one slow request from starting last and
+# stretching the run on its own.
+
+CRITICAL_TAG = 'critical'
+
+def is_critical(api):
+    return CRITICAL_TAG in (api.get('tags') or ())
+
+class LatencyHistory:
+    def __init__(self, max_samples=5):
+        self.max_samples = max_samples
+        self.samples = {}
+    
+    @staticmethod
+    def keys(record):
+        """Lookup keys for a result or request: fingerprint, then method + URL"""
+        keys = [f"{record.get('method', 'GET')} {record.get('url')}"]
+        fingerprint = record.get('fingerprint') or record.get('api_info', {}).get('fingerprint')
+        return [fingerprint] + keys if fingerprint else keys
+    
+    def add(self, record):
+        """Remember the response time of one earlier result"""
+        if str(record.get('skipped')).lower() == 'true' or str(record.get('deduplicated')).lower() == 'true':
+            return
+        try:
+            seconds = float(record.get('response_time') or 0)
+        except ValueError:
+            return
+        if seconds <= 0:
+            return
+        for key in self.keys(record):
+            self.samples.setdefault(key, deque(maxlen=self.max_samples)).append(seconds)
+    
+    def load(self, path):
+        """Read an earlier results file; returns the number of results read"""
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.csv'):
+                records = list(csv.DictReader(f))
+            elif path.endswith('.json'):
+                records = json.load(f)
+                records = records if isinstance(records, list) else [records]
+            else:
+                records = [json.loads(line) for line in f if line.strip()]
+        
+        for record in records:
+            self.add(record)
+        return len(records)
+    
+    def expected(self, api):
+        """Median latency of api in earlier runs, or None if never seen"""
+        for key in self.keys(api):
+            samples = self.samples.get(key)
+            if samples:
+                return sorted(samples)[len(samples) // 2]
+        return None
+    
+    def plan(self, apis, workers):
+        """Order apis critical first, then longest expected first
+        
+        Returns (ordered apis, schedule) where schedule holds the predicted
+        makespan on workers parallel slots. Endpoints with no history count
+        at the median of those with some.
+        """
+        expected = [self.expected(api) for api in apis]
+        known = sorted(seconds for seconds in expected if seconds is not None)
+        fallback = known[len(known) // 2] if known else 0
+        costs = [fallback if seconds is None else seconds for seconds in expected]
+        
+        order = sorted(range(len(apis)), key=lambda i: (not is_critical(apis[i]), -costs[i]))
+        
+        # Greedy list scheduling: each request starts on the first worker to free up
+        slots = [0.0] * max(1, min(workers, len(apis)))
+        for i in order:
+            heapq.heappush(slots, heapq.heappop(slots) + costs[i])
+        
+        return [apis[i] for i in order], {
+            'predicted': round(max(slots), 3) if known else None,
+            'known': len(known),
+            'critical': sum(1 for api in apis if is_critical(api))
+        }
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+import threading
+
+class SessionPool:
+    def __init__(self, pool_file='sessions.json', ttl=3600):
+        self.pool_file = pool_file
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.sessions = self._load()
+    
+    def _load(self):
+        try:
+            with open(self.pool_file, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save(self):
+        try:
+            # Cookies and auth headers are credentials: owner-only, never half-written
+            tmp_file = self.pool_file + '.tmp'
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.sessions, f, indent=2)
+            os.chmod(tmp_file, 0o600)
+            os.replace(tmp_file, self.pool_file)
+        except Exception as e:
+            print(f"Error saving session pool: {e}")
+    
+    def _key(self, login_url, username):
+        return f"{username}@{login_url}"
+    
+    def get(self, login_url, username):
+        """Return a live pooled session, or None if missing or expired"""
+        key = self._key(login_url, username)
+        with self.lock:
+            entry = self.sessions.get(key)
+            if not entry:
+                return None
+            if time.time() >= entry['expires_at']:
+                del self.sessions[key]
+                self._save()
+                return None
+            return entry
+    
+    def put(self, login_url, username, cookie_jar=None, cookies=None, headers=None, ttl=None):
+        """Store a logged-in session
+        
+        The entry expires after the pool TTL or when the first persistent
+        cookie in the jar expires, whichever comes first.
+        """
+        expires_at = time.time() + (ttl or self.ttl)
+        jar = []
+        
+        for cookie in cookie_jar or []:
+            jar.append({
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'expires': cookie.expires
+            })
+            if cookie.expires:
+                expires_at = min(expires_at, cookie.expires)
+        
+        entry = {
+            'login_url': login_url,
+            'username': username,
+            'cookies': cookies if cookies is not None else {c['name']: c['value'] for c in jar},
+            'cookie_jar': jar,
+            'headers': headers or {},
+            'created_at': time.time(),
+            'expires_at': expires_at
+        }
+        
+        with self.lock:
+            self.sessions[self._key(login_url, username)] = entry
+            self._save()
+        
+        return entry
+    
+    def restore(self, entry, session):
+        """Load a pooled cookie jar back into a requests session"""
+        if entry['cookie_jar']:
+            for cookie in entry['cookie_jar']:
+                session.cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie['domain'],
+                    path=cookie['path'],
+                    expires=cookie['expires']
+                )
+        else:
+            session.cookies.update(entry['cookies'])
+        session.headers.update(entry['headers'])
+    
+    def invalidate(self, login_url, username):
+        """Drop a session that the server no longer accepts"""
+        with self.lock:
+            if self.sessions.pop(self._key(login_url, username), None):
+                self._save()
+                return True
+        return False
@@ -1,11 +1,30 @@
 import logging
+import asyncio
+import re
+import time
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
+from telegram.helpers import escape_markdown
 import json
 import os
 import requests
+from datetime import datetime
 from api_tester import APITester
-from data_manager import DataManager
+from retry_policy import RetryPolicy
+from data_manager import DataStorePool
+from session_pool import SessionPool
+from bot_jobs import BackgroundJobQueue, JobRejected
+from load_bench import run_benchmark, render_histogram
+from endpoint_monitor import EndpointMonitor, parse_interval
+from log_reader import prepare_log, parse_since
+
+# Telegram allows roughly one edit per second per chat; stay well below it
+BENCH_EDIT_INTERVAL = 3
+BENCH_MAX_REQUESTS = 1000
+BENCH_MAX_CONCURRENCY = 50
+
+# Log uploads above this size are gzipped first
+LOG_GZIP_THRESHOLD = 1024 * 1024
 
 # Enable logging
 logging.basicConfig(
@@ -16,9 +35,18 @@ logging.basicConfig(
 class TelegramBot:
     def __init__(self, token):
         self.token = token
-        self.application = Application.builder().token(token).build()
-        self.api_tester = APITester()
-        self.data_manager = DataManager()
+        self.application = (
+            Application.builder()
+            .token(token)
+            .post_init(self._start_jobs)
+            .post_shutdown(self._stop_jobs)
+            .build()
+        )
+        self.data_stores = DataStorePool(os.path.join('data', 'chats'))
+        self.session_pool = SessionPool()
+        self.jobs = BackgroundJobQueue(workers=4, max_size=100, max_per_chat=20)
+        self.monitor = EndpointMonitor()
+        self.monitor_task = None
         
         # Register handlers
         self.setup_handlers()
@@ -26,11 +54,23 @@ class TelegramBot:
     def setup_handlers(self):
         self.application.add_handler(CommandHandler("start", self.start))
         self.application.add_handler(CommandHandler("test", self.test_api))
+        self.application.add_handler(CommandHandler("bench", self.bench))
+        self.application.add_handler(CommandHandler("watch", self.watch))
+        self.application.add_handler(CommandHandler("unwatch", self.unwatch))
         self.application.add_handler(CommandHandler("login", self.login_protected))
         self.application.add_handler(CommandHandler("results", self.get_results))
         self.application.add_handler(CommandHandler("logs", self.get_logs))
         self.application.add_handler(CommandHandler("status", self.get_status))
         
+    async def _start_jobs(self, application):
+        await self.jobs.start()
+        self.monitor_task = asyncio.create_task(self.monitor.run(self._send_watch_alert))
+    
+    async def _stop_jobs(self, application):
+        if self.monitor_task:
+            self.monitor_task.cancel()
+        await self.jobs.stop()
+        
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Send welcome message when command /start is issued."""
         keyboard = [
@@ -54,9 +94,12 @@ class TelegramBot:
             'Available commands:\n'
             '/start - Show this menu\n'
             '/test <url> [method] - Test an API endpoint\n' 
+            '/bench <url> [n] [concurrency] - Load test an endpoint\n'
+            '/watch <url> <interval> [max_ms] - Monitor an endpoint\n'
+            '/unwatch <url|all> - Stop monitoring\n'
             '/login - Login to protected API\n'
             '/results - Get latest test results\n'
-            '/logs - Download log files\n'
+            '/logs [file] [tail N] [since T] [grep P] - Download logs\n'
             '/status - Check system status',
             reply_markup=reply_markup,
             parse_mode='Markdown'
@@ -64,86 +107,125 @@ class TelegramBot:
     
     async def login_protected(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Login to protected API"""
-        try:
-            # Load config
-            with open('config.json', 'r') as f:
-                config = json.load(f)
-                
-            login_url = config.get('login_url')
-            protected_url = config.get('protected_api_url')
-            username = config.get('username')
-            password = config.get('password')
-            
-            if not all([login_url, username, password]):
-                await update.message.reply_text(
-                    '❌ *Missing Configuration*\n\n'
-                    'Please set in config:\n'
-                    '• Login URL\n• Username\n• Password\n• Protected API URL',
-                    parse_mode='Markdown'
-                )
-                return
-                
-            await update.message.reply_text('🔄 Logging in to protected API...')
+        await self._submit_job(
+            update,
+            'login',
+            self._run_protected_login,
+            update.effective_chat.id,
+            on_done=self._report_protected_login,
+            description='Logging in to protected API...'
+        )
+    
+    def _run_protected_login(self, chat_id):
+        """Blocking part of /login, runs on a background worker"""
+        # Load config
+        with open('config.json', 'r') as f:
+            config = json.load(f)
             
-            # Login request
-            login_data = {'username': username, 'password': password}
-            login_response = requests.post(login_url, json=login_data)
+        login_url = config.get('login_url')
+        protected_url = config.get('protected_api_url')
+        username = config.get('username')
+        password = config.get('password')
+        
+        if not all([login_url, username, password]):
+            return {'missing_config': True}
+        
+        # Reuse a pooled session, logging in only if there is none
+        session = self._api_login(login_url, username, password)
+        if not session['success']:
+            return {'login_failed': True, **session}
+        
+        # Access protected API
+        protected_response = requests.get(protected_url, headers=session['headers'], cookies=session['cookies'])
+        
+        # Pooled session was rejected - log in again once
+        if protected_response.status_code in (401, 403) and session['reused']:
+            session = self._api_login(login_url, username, password, force=True)
+            if session['success']:
+                protected_response = requests.get(protected_url, headers=session['headers'], cookies=session['cookies'])
+        
+        result = {
+            'url': protected_url,
+            'method': 'GET',
+            'status_code': protected_response.status_code,
+            'timestamp': datetime.now().isoformat(),
+            'success': protected_response.status_code == 200,
+            'type': 'protected_api'
+        }
+        
+        try:
+            result['response'] = protected_response.json()
+        except:
+            result['response'] = protected_response.text
             
-            if login_response.status_code == 200:
-                # Access protected API
-                headers = {}
-                try:
-                    token = login_response.json().get('token') or login_response.json().get('access_token')
-                    if token:
-                        headers['Authorization'] = f'Bearer {token}'
-                except:
-                    pass
-                    
-                protected_response = requests.get(protected_url, headers=headers, cookies=login_response.cookies)
-                
-                result = {
-                    'url': protected_url,
-                    'method': 'GET',
-                    'status_code': protected_response.status_code,
-                    'timestamp': datetime.now().isoformat(),
-                    'success': protected_response.status_code == 200,
-                    'type': 'protected_api'
-                }
-                
-                try:
-                    result['response'] = protected_response.json()
-                except:
-                    result['response'] = protected_response.text
-                    
-                self.data_manager.save_response(result)
-                
-                if result['success']:
-                    await update.message.reply_text(
-                        f'✅ *Protected API Access Successful!*\n\n'
-                        f'📊 Status: {result["status_code"]}\n'
-                        f'🔐 Type: Protected API\n'
-                        f'💾 Saved to logs',
-                        parse_mode='Markdown'
-                    )
-                else:
-                    await update.message.reply_text(
-                        f'❌ *Protected API Access Failed*\n\n'
-                        f'📊 Status: {result["status_code"]}\n'
-                        f'🔐 Type: Protected API',
-                        parse_mode='Markdown'
-                    )
-            else:
-                await update.message.reply_text(
-                    f'❌ *Login Failed!*\n\n'
-                    f'Status: {login_response.status_code}\n'
-                    f'Response: {login_response.text}',
-                    parse_mode='Markdown'
-                )
-                
-        except Exception as e:
-            await update.message.reply_text(f'❌ Error: {str(e)}')
+        self.data_stores.get(chat_id).save_response(result)
+        return result
+    
+    async def _report_protected_login(self, job):
+        """Post the outcome of a /login job to its chat"""
+        result = job['result']
+        
+        if job['error']:
+            message = f'❌ Error: {escape_markdown(str(job["error"]))}'
+        elif result.get('missing_config'):
+            message = (
+                '❌ *Missing Configuration*\n\n'
+                'Please set in config:\n'
+                '• Login URL\n• Username\n• Password\n• Protected API URL'
+            )
+        elif result.get('login_failed'):
+            message = (
+                f'❌ *Login Failed!*\n\n'
+                f'Status: {result["status_code"]}\n'
+                f'Response: {escape_markdown(str(result["response"]))}'
+            )
+        elif result['success']:
+            message = (
+                f'✅ *Protected API Access Successful!*\n\n'
+                f'📊 Status: {result["status_code"]}\n'
+                f'🔐 Type: Protected API\n'
+                f'💾 Saved to logs'
+            )
+        else:
+            message = (
+                f'❌ *Protected API Access Failed*\n\n'
+                f'📊 Status: {result["status_code"]}\n'
+                f'🔐 Type: Protected API'
+            )
+        
+        await self._send_job_message(job, message)
+    
+    def _api_login(self, login_url, username, password, force=False):
+        """Return pooled session credentials, logging in when missing, expired or forced"""
+        if force:
+            self.session_pool.invalidate(login_url, username)
+        else:
+            entry = self.session_pool.get(login_url, username)
+            if entry:
+                return {'success': True, 'cookies': entry['cookies'], 'headers': entry['headers'], 'reused': True}
+        
+        # Login request
+        login_data = {'username': username, 'password': password}
+        login_response = requests.post(login_url, json=login_data)
+        
+        if login_response.status_code != 200:
+            return {
+                'success': False,
+                'status_code': login_response.status_code,
+                'response': login_response.text
+            }
+        
+        headers = {}
+        try:
+            token = login_response.json().get('token') or login_response.json().get('access_token')
+            if token:
+                headers['Authorization'] = f'Bearer {token}'
+        except:
+            pass
+        
+        entry = self.session_pool.put(login_url, username, cookie_jar=login_response.cookies, headers=headers)
+        return {'success': True, 'cookies': entry['cookies'], 'headers': headers, 'reused': False}
         
-    # ... rest of the existing methods remain same
     async def test_api(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Test an API endpoint"""
         if not context.args:
@@ -157,56 +239,262 @@ class TelegramBot:
         url = context.args[0]
         method = context.args[1].upper() if len(context.args) > 1 else 'GET'
         
-        await update.message.reply_text(f'🔄 Testing {method} {url}...')
+        await self._submit_job(
+            update,
+            'test',
+            self._run_api_test,
+            url,
+            method,
+            update.effective_chat.id,
+            on_done=self._report_api_test,
+            description=f'Testing {method} {url}...'
+        )
+    
+    def _run_api_test(self, url, method, chat_id):
+        """Blocking part of /test, runs on a background worker"""
+        api_info = {'url': url, 'method': method, 'headers': {}, 'cookies': {}}
+        # One tester per job: workers never share a session, and results do not pile up
+        result = APITester().test_api_endpoint(api_info)
+        self.data_stores.get(chat_id).save_response(result)
+        return result
+    
+    async def _report_api_test(self, job):
+        """Post the outcome of a /test job to its chat"""
+        result = job['result']
+        
+        if job['error']:
+            message = f'❌ Error testing API: {escape_markdown(str(job["error"]))}'
+        elif result['success']:
+            message = (
+                f'✅ *API Test Successful!*\n\n'
+                f'📊 *Status Code:* {result["status_code"]}\n'
+                f'⏱️ *Response Time:* {result["response_time"]:.2f}s\n'
+                f'🕐 *Timestamp:* {result["timestamp"]}\n'
+                f'💾 *Saved to:* data.json, data.txt'
+            )
+        else:
+            message = (
+                f'❌ *API Test Failed!*\n\n'
+                f'📊 *Status Code:* {result["status_code"]}\n'
+                f'⏱️ *Response Time:* {result["response_time"]:.2f}s\n'
+                f'🕐 *Timestamp:* {result["timestamp"]}\n'
+                f'🚨 *Error:* {escape_markdown(str(result.get("error", "Unknown error")))}'
+            )
         
+        await self._send_job_message(job, message)
+    
+    async def bench(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Load test an API endpoint with live progress"""
         try:
-            result = self.api_tester.test_endpoint(url, method)
-            self.data_manager.save_response(result)
-            
-            if result['success']:
-                message = (
-                    f'✅ *API Test Successful!*\n\n'
-                    f'📊 *Status Code:* {result["status_code"]}\n'
-                    f'⏱️ *Response Time:* {result["response_time"]:.2f}s\n'
-                    f'🕐 *Timestamp:* {result["timestamp"]}\n'
-                    f'💾 *Saved to:* data.json, data.txt'
-                )
-            else:
-                message = (
-                    f'❌ *API Test Failed!*\n\n'
-                    f'📊 *Status Code:* {result["status_code"]}\n'
-                    f'⏱️ *Response Time:* {result["response_time"]:.2f}s\n'
-                    f'🕐 *Timestamp:* {result["timestamp"]}\n'
-                    f'🚨 *Error:* {result.get("error", "Unknown error")}'
-                )
-                
-            await update.message.reply_text(message, parse_mode='Markdown')
+            url = context.args[0]
+            count = int(context.args[1]) if len(context.args) > 1 else 50
+            concurrency = int(context.args[2]) if len(context.args) > 2 else 5
+        except (IndexError, ValueError):
+            await update.message.reply_text(
+                '❌ Please provide a URL to benchmark.\n'
+                'Usage: /bench <url> [n] [concurrency]\n'
+                'Example: /bench https://api.example.com/data 200 10'
+            )
+            return
+        
+        count = max(1, min(count, BENCH_MAX_REQUESTS))
+        concurrency = max(1, min(concurrency, BENCH_MAX_CONCURRENCY, count))
+        
+        # The progress message is only known once the job has been queued
+        progress = {'message': None, 'loop': asyncio.get_running_loop()}
+        job = await self._submit_job(
+            update,
+            'bench',
+            self._run_bench,
+            url,
+            count,
+            concurrency,
+            progress,
+            on_done=self._report_bench,
+            description=f'Benchmarking GET {url} ({count} requests, concurrency {concurrency})...'
+        )
+        if job:
+            progress['message'] = job['reply']
+    
+    def _run_bench(self, url, count, concurrency, progress):
+        """Blocking part of /bench, runs on a background worker"""
+        state = {'last_edit': 0, 'pending': None}
+        
+        def on_progress(done, total, latencies, errors):
+            now = time.time()
+            if not progress['message'] or now - state['last_edit'] < BENCH_EDIT_INTERVAL:
+                return
+            # Never stack edits: skip this tick if the previous one is still in flight
+            if state['pending'] and not state['pending'].done():
+                return
             
+            state['last_edit'] = now
+            mean = sum(latencies) / len(latencies) if latencies else 0
+            text = (
+                f'🏁 Benchmarking {url}\n'
+                f'{self._progress_bar(done, total)} {done}/{total}\n'
+                f'⏱️ mean {mean * 1000:.0f}ms, ❌ errors {errors}'
+            )
+            state['pending'] = asyncio.run_coroutine_threadsafe(
+                self._edit_progress(progress['message'], text), progress['loop']
+            )
+        
+        # A fresh tester per job keeps each benchmark's session and results to itself
+        tester = APITester(retry_policy=RetryPolicy(max_attempts=1))
+        return run_benchmark(url, 'GET', count, concurrency, progress=on_progress, tester=tester)
+    
+    def _progress_bar(self, done, total, width=20):
+        filled = int(done / total * width)
+        return '▓' * filled + '░' * (width - filled)
+    
+    async def _edit_progress(self, message, text):
+        try:
+            await message.edit_text(text)
         except Exception as e:
-            await update.message.reply_text(f'❌ Error testing API: {str(e)}')
+            # Rate limited or unchanged text - the next tick will catch up
+            logging.debug(f"Progress edit skipped: {e}")
+    
+    async def _report_bench(self, job):
+        """Post the /bench percentile summary and histogram"""
+        summary = job['result']
+        
+        if job['error']:
+            await self._send_job_message(job, f'❌ Error running benchmark: {escape_markdown(str(job["error"]))}')
+            return
+        
+        if job.get('reply'):
+            await self._edit_progress(
+                job['reply'],
+                f'🏁 Benchmark of {summary["url"]} complete\n'
+                f'{self._progress_bar(1, 1)} {summary["count"]}/{summary["count"]}'
+            )
+        
+        codes = ', '.join(f'{code or "error"}: {n}' for code, n in sorted(summary['status_codes'].items()))
+        message = (
+            f'📊 *Benchmark Results*\n\n'
+            f'🌐 *URL:* {escape_markdown(summary["url"])}\n'
+            f'🔢 *Requests:* {summary["count"]} @ concurrency {summary["concurrency"]}\n'
+            f'⚡ *Throughput:* {summary["requests_per_second"]:.1f} req/s in {summary["elapsed"]:.1f}s\n'
+            f'❌ *Errors:* {summary["errors"]}\n'
+            f'📋 *Status Codes:* {codes}\n\n'
+            f'```\n'
+            f'min {summary["min"] * 1000:7.0f}ms   p50 {summary["p50"] * 1000:7.0f}ms\n'
+            f'p90 {summary["p90"] * 1000:7.0f}ms   p95 {summary["p95"] * 1000:7.0f}ms\n'
+            f'p99 {summary["p99"] * 1000:7.0f}ms   max {summary["max"] * 1000:7.0f}ms\n\n'
+            f'{render_histogram(summary["latencies"])}\n'
+            f'```'
+        )
+        
+        await self._send_job_message(job, message)
+    
+    async def watch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Monitor an endpoint on a schedule, or list watched endpoints"""
+        chat_id = update.effective_chat.id
+        
+        if not context.args:
+            watches = self.monitor.list(chat_id)
+            if not watches:
+                await update.message.reply_text(
+                    'No endpoints watched.\n'
+                    'Usage: /watch <url> <interval> [max_ms]\n'
+                    'Example: /watch https://api.example.com/health 5m 800'
+                )
+                return
             
+            icons = {'up': '✅', 'slow': '🐢', 'down': '❌', None: '⏳'}
+            lines = [
+                f'{icons[w["state"]]} {w["url"]} every {w["interval"]}s'
+                + (f' ({w["response_time"] * 1000:.0f}ms)' if w['response_time'] is not None else '')
+                for w in watches
+            ]
+            await update.message.reply_text('👀 Watched endpoints\n\n' + '\n'.join(lines))
+            return
+        
+        try:
+            url = context.args[0]
+            interval = parse_interval(context.args[1]) if len(context.args) > 1 else 300
+            latency_threshold = int(context.args[2]) / 1000 if len(context.args) > 2 else None
+            watch = self.monitor.add(chat_id, url, interval, latency_threshold)
+        except ValueError as e:
+            await update.message.reply_text(f'❌ {str(e)}')
+            return
+        
+        await update.message.reply_text(
+            f'👀 Watching {url}\n'
+            f'⏱️ Every {watch["interval"]}s, alert above {watch["latency_threshold"] * 1000:.0f}ms\n'
+            f'🔔 You will only be notified when its state changes'
+        )
+    
+    async def unwatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Stop monitoring one endpoint or all of them"""
+        if not context.args:
+            await update.message.reply_text('Usage: /unwatch <url|all>')
+            return
+        
+        url = None if context.args[0].lower() == 'all' else context.args[0]
+        removed = self.monitor.remove(update.effective_chat.id, url)
+        
+        if removed:
+            await update.message.reply_text(f'🛑 Stopped watching {removed} endpoint(s)')
+        else:
+            await update.message.reply_text('❌ That endpoint is not being watched')
+    
+    async def _send_watch_alert(self, watch, previous, result):
+        """Tell a chat that one of its watched endpoints changed state"""
+        if result['state'] == 'down':
+            message = f'🚨 DOWN: {watch["url"]}\nStatus: {result["status_code"] or result.get("error", "no response")}'
+        elif result['state'] == 'slow':
+            message = (
+                f'🐢 SLOW: {watch["url"]}\n'
+                f'Latency {result["response_time"] * 1000:.0f}ms > {watch["latency_threshold"] * 1000:.0f}ms'
+            )
+        else:
+            message = f'✅ RECOVERED: {watch["url"]}\nLatency {result["response_time"] * 1000:.0f}ms (was {previous})'
+        
+        await self.application.bot.send_message(chat_id=watch['chat_id'], text=message)
+    
+    async def _submit_job(self, update, name, func, *args, on_done=None, description=''):
+        """Queue blocking work and answer right away with the job ID"""
+        try:
+            job = self.jobs.submit(update.effective_chat.id, name, func, *args, on_done=on_done)
+        except JobRejected as e:
+            await update.message.reply_text(f'⏳ {str(e)}')
+            return None
+        
+        # Descriptions carry user-supplied URLs; an unescaped _ or * would make Telegram reject the reply
+        job['reply'] = await update.message.reply_text(
+            f'🧾 Job `{job["id"]}` queued\n🔄 {escape_markdown(description)}',
+            parse_mode='Markdown'
+        )
+        return job
+    
+    async def _send_job_message(self, job, message):
+        """Send a finished job's report to the chat that requested it"""
+        await self.application.bot.send_message(
+            chat_id=job['chat_id'],
+            text=f'🧾 Job `{job["id"]}` finished\n\n{message}',
+            parse_mode='Markdown'
+        )
+    
     async def get_results(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Get latest test results"""
         try:
-            if os.path.exists('data.json'):
-                with open('data.json', 'r') as f:
-                    data = json.load(f)
-                    
-                if isinstance(data, list) and data:
-                    latest = data[-1]  # Get latest result
-                    message = (
-                        f'📊 *Latest Test Results*\n\n'
-                        f'🌐 *URL:* {latest.get("url", "N/A")}\n'
-                        f'⚡ *Method:* {latest.get("method", "N/A")}\n'
-                        f'📋 *Status:* {latest.get("status_code", "N/A")}\n'
-                        f'⏱️ *Time:* {latest.get("response_time", 0):.2f}s\n'
-                        f'✅ *Success:* {latest.get("success", False)}\n'
-                        f'🕐 *When:* {latest.get("timestamp", "N/A")}'
-                    )
-                    if latest.get('type') == 'protected_api':
-                        message += '\n🔐 *Type:* Protected API'
-                else:
-                    message = 'No test results found.'
+            store = self.data_stores.get(update.effective_chat.id)
+            data = await asyncio.to_thread(store.load_results)
+                
+            if data:
+                latest = data[-1]  # Get latest result
+                message = (
+                    f'📊 *Latest Test Results*\n\n'
+                    f'🌐 *URL:* {latest.get("url", "N/A")}\n'
+                    f'⚡ *Method:* {latest.get("method", "N/A")}\n'
+                    f'📋 *Status:* {latest.get("status_code", "N/A")}\n'
+                    f'⏱️ *Time:* {latest.get("response_time", 0):.2f}s\n'
+                    f'✅ *Success:* {latest.get("success", False)}\n'
+                    f'🕐 *When:* {latest.get("timestamp", "N/A")}'
+                )
+                if latest.get('type') == 'protected_api':
+                    message += '\n🔐 *Type:* Protected API'
             else:
                 message = 'No test results found.'
                 
@@ -216,43 +504,94 @@ class TelegramBot:
             await update.message.reply_text(f'❌ Error getting results: {str(e)}')
             
     async def get_logs(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Send log files"""
+        """Send log files, optionally only their tail, recent or matching lines"""
         log_files = ['system.log', 'earnings.log', 'data.txt']
         
-        for log_file in log_files:
-            if os.path.exists(log_file):
+        try:
+            options = self._parse_log_options(context.args or [], log_files)
+        except ValueError as e:
+            await update.message.reply_text(
+                f'❌ {str(e)}\n'
+                'Usage: /logs [file] [tail N] [since 2h|2024-01-31T12:00] [grep pattern]\n'
+                'Example: /logs system.log tail 200 grep FAILED'
+            )
+            return
+        
+        store = self.data_stores.get(update.effective_chat.id)
+        
+        for log_file in options.pop('files') or log_files:
+            if os.path.exists(store.path(log_file)):
                 try:
-                    with open(log_file, 'rb') as f:
-                        await update.message.reply_document(
-                            document=f,
-                            filename=log_file,
-                            caption=f'📋 {log_file}'
-                        )
+                    prepared = await asyncio.to_thread(
+                        prepare_log, store.path(log_file), gzip_threshold=LOG_GZIP_THRESHOLD, **options
+                    )
+                    try:
+                        caption = f'📋 {log_file}'
+                        if prepared['lines'] is not None:
+                            caption += f' ({prepared["lines"]} lines)'
+                        if prepared['filename'].endswith('.gz'):
+                            caption += f' - gzip of {prepared["size"] // 1024} KiB'
+                        
+                        with open(prepared['path'], 'rb') as f:
+                            await update.message.reply_document(
+                                document=f,
+                                filename=prepared['filename'],
+                                caption=caption
+                            )
+                    finally:
+                        if prepared['temporary']:
+                            os.remove(prepared['path'])
                 except Exception as e:
                     await update.message.reply_text(f'❌ Error sending {log_file}: {str(e)}')
             else:
                 await update.message.reply_text(f'📭 {log_file} not found')
+    
+    def _parse_log_options(self, args, log_files):
+        """Parse /logs arguments into prepare_log keyword arguments"""
+        options = {'files': [], 'tail': None, 'since': None, 'pattern': None}
+        args = list(args)
+        
+        while args:
+            arg = args.pop(0)
+            if arg in log_files:
+                options['files'].append(arg)
+            elif arg.lower() in ('tail', 'since', 'grep'):
+                if not args:
+                    raise ValueError(f'Missing value for {arg}')
+                value = args.pop(0)
+                if arg.lower() == 'tail':
+                    if not value.isdigit() or int(value) < 1:
+                        raise ValueError(f'Invalid line count: {value}')
+                    options['tail'] = int(value)
+                elif arg.lower() == 'since':
+                    options['since'] = parse_since(value)
+                else:
+                    try:
+                        re.compile(value)
+                    except re.error as e:
+                        raise ValueError(f'Invalid pattern: {e}')
+                    options['pattern'] = value
+            else:
+                raise ValueError(f'Unknown option: {arg}')
+        
+        return options
                 
     async def get_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Get system status"""
         try:
-            # Count test results
-            test_count = 0
-            protected_count = 0
-            if os.path.exists('data.json'):
-                with open('data.json', 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        test_count = len(data)
-                        protected_count = len([x for x in data if x.get('type') == 'protected_api'])
-                    else:
-                        test_count = 1
-                        if data.get('type') == 'protected_api':
-                            protected_count = 1
+            # Count this chat's test results
+            store = self.data_stores.get(update.effective_chat.id)
+            data = await asyncio.to_thread(store.load_results)
+            test_count = len(data)
+            protected_count = len([x for x in data if x.get('type') == 'protected_api'])
                     
             # Check log sizes
-            system_log_size = os.path.getsize('system.log') if os.path.exists('system.log') else 0
-            earnings_log_size = os.path.getsize('earnings.log') if os.path.exists('earnings.log') else 0
+            system_log = store.path('system.log')
+            earnings_log = store.path('earnings.log')
+            system_log_size = os.path.getsize(system_log) if os.path.exists(system_log) else 0
+            earnings_log_size = os.path.getsize(earnings_log) if os.path.exists(earnings_log) else 0
+            
+            queue = self.jobs.stats(update.effective_chat.id)
             
             message = (
                 f'📈 *System Status*\n\n'
@@ -260,6 +599,10 @@ class TelegramBot:
                 f'🔐 *Protected APIs:* {protected_count}\n'
                 f'📊 *System Log Size:* {system_log_size} bytes\n'
                 f'💰 *Earnings Log Size:* {earnings_log_size} bytes\n'
+                f'🧾 *Job Queue:* {queue["queued"]}/{queue["max_size"]} queued, '
+                f'{queue["running"]}/{queue["workers"]} running\n'
+                f'👤 *Your Queued Jobs:* {queue["chat_queued"]}\n'
+                f'⏳ *Wait Time:* {queue["avg_wait"]:.1f}s avg, {queue["oldest_wait"]:.1f}s oldest\n'
                 f'🤖 *Bot Status:* ✅ Online\n'
                 f'🛠️ *API Tester:* ✅ Ready'
             )
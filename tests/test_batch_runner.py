@@ -0,0 +1,92 @@
+import io
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from api_tester import APITester
+from batch_runner import BatchRunner, ResultWriter
+from checkpoint import RunCheckpoint
+from deadline import Deadline, DEADLINE_REASON
+
+class Handler(BaseHTTPRequestHandler):
+    hits = []
+    
+    def do_GET(self):
+        self.hits.append(self.path)
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        status = 200
+        if self.path.startswith('/private') and 'sid=new' not in (self.headers.get('Cookie') or ''):
+            status = 401
+        elif self.path.startswith('/forbidden'):
+            status = 403
+        body = b'{"ok": 1}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    Handler.hits = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def run(apis, checkpoint=None, resume=False, deadline=None, auth_cookies=None, relogin=None, concurrency=1):
+    runner = BatchRunner(APITester(deadline=deadline), concurrency=concurrency, progress_stream=io.StringIO())
+    output = io.StringIO()
+    summary = runner.run([dict(api) for api in apis], ResultWriter(output), auth_cookies, checkpoint, resume, relogin)
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+def endpoints(server, names):
+    return [{'url': f'{server}/{name}', 'method': 'GET', 'headers': {}, 'cookies': {}} for name in names]
+
+def test_deadline_skips_are_tested_on_resume(server, tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    apis = endpoints(server, ['fast/a', 'fast/b', 'slow/c', 'fast/d', 'fast/e'])
+    
+    # fast/d starts after slow/c, with less than min_timeout left
+    summary, results = run(apis, RunCheckpoint(path), deadline=Deadline(1.0, request_timeout=5, min_timeout=0.7))
+    assert summary['skipped'] == 2
+    assert {r['url'] for r in results if r['error'] == DEADLINE_REASON} == {apis[3]['url'], apis[4]['url']}
+    assert (tmp_path / 'run.checkpoint').exists()
+    
+    Handler.hits = []
+    summary, results = run(apis, RunCheckpoint(path), resume=True)
+    
+    assert sorted(Handler.hits) == ['/fast/d', '/fast/e']
+    assert summary['resumed'] == 3
+    assert summary['skipped'] == 0 and summary['successful'] == 5
+    assert not (tmp_path / 'run.checkpoint').exists()
+
+def test_expired_pooled_session_is_replaced_once(server):
+    logins = []
+    
+    def relogin():
+        logins.append(1)
+        return {'success': True, 'cookies': {'sid': 'new'}}
+    
+    apis = endpoints(server, [f'private/{i}' for i in range(6)] + ['forbidden/a'])
+    summary, results = run(apis, auth_cookies={'sid': 'old'}, relogin=relogin, concurrency=3)
+    
+    assert len(logins) == 1
+    assert summary['successful'] == 6
+    assert [r['url'] for r in results if not r['success']] == [apis[-1]['url']]
+    assert len(results) == len(apis)
+
+def test_failed_relogin_keeps_the_rejections(server):
+    apis = endpoints(server, ['private/a', 'private/b'])
+    summary, results = run(apis, auth_cookies={'sid': 'old'},
+                           relogin=lambda: {'success': False, 'error': 'bad password'})
+    
+    assert summary['failed'] == 2
+    assert {r['status_code'] for r in results} == {401}
@@ -0,0 +1,76 @@
+import os
+import json
+import stat
+from checkpoint import RunCheckpoint, REDACTED, redact
+
+def result(url, **extra):
+    data = {'url': url, 'method': 'GET', 'status_code': 200, 'success': True}
+    data.update(extra)
+    return data
+
+def write_journal(path, run_id, results):
+    journal = RunCheckpoint(str(path))
+    journal.open(run_id)
+    for fingerprint, data in results.items():
+        journal.record(fingerprint, data)
+    journal.close()
+
+def test_resume_reads_finished_requests(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    write_journal(path, 'run-1', {'a': result('https://x/a'), 'b': result('https://x/b')})
+    
+    journal = RunCheckpoint(str(path))
+    assert journal.load('run-1') == 2
+    assert journal.completed['b']['url'] == 'https://x/b'
+
+def test_journal_of_another_run_is_ignored(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    write_journal(path, 'run-1', {'a': result('https://x/a')})
+    
+    assert RunCheckpoint(str(path)).load('run-2') == 0
+
+def test_half_written_line_is_dropped_before_appending(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    write_journal(path, 'run-1', {'a': result('https://x/a')})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"fingerprint": "b", "resu')
+    
+    journal = RunCheckpoint(str(path))
+    assert journal.load('run-1') == 1
+    journal.open('run-1', resume=True)
+    journal.record('c', result('https://x/c'))
+    journal.close()
+    
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['fingerprint'] for line in lines[1:]] == ['a', 'c']
+    assert RunCheckpoint(str(path)).load('run-1') == 2
+
+def test_close_can_remove_the_journal(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    journal = RunCheckpoint(str(path))
+    journal.open('run-1')
+    journal.close(remove=True)
+    
+    assert not path.exists()
+
+def test_journal_is_owner_only_and_holds_no_credentials(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    path.write_text('left by an older run\n')
+    os.chmod(path, 0o644)
+    secret = result(
+        'https://x/a',
+        cookies_used={'uid': 'SECRET1'},
+        headers={'Authorization': 'Bearer SECRET2', 'Accept': 'application/json'},
+        api_info={'url': 'https://x/a', 'cookies': {'pref': 'SECRET3'}, 'params': {'api_key': 'SECRET4'}}
+    )
+    write_journal(path, 'run-1', {'a': secret})
+    
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert 'SECRET' not in path.read_text(encoding='utf-8')
+    assert secret['cookies_used'] == {'uid': 'SECRET1'}
+
+def test_redact_keeps_harmless_fields():
+    redacted = redact(result('https://x/a', headers={'Accept': 'text/html', 'X-Api-Key': 'k'}))
+    
+    assert redacted['headers'] == {'Accept': 'text/html', 'X-Api-Key': REDACTED}
+    assert redacted['status_code'] == 200
@@ -0,0 +1,55 @@
+import time
+from circuit_breaker import CircuitBreaker, HostCircuitBreakers, CLOSED, OPEN, HALF_OPEN, host_key
+
+def test_opens_at_the_failure_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure('refused')
+    assert breaker.allow()
+    
+    breaker.record_failure('refused')
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()['skipped'] == 1
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    
+    assert breaker.state == CLOSED
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.01)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    
+    breaker.record_failure('timeout')
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+
+def test_breakers_are_per_host():
+    breakers = HostCircuitBreakers(failure_threshold=1)
+    breakers.get('https://Dead.example.com/a').record_failure('refused')
+    
+    assert not breakers.get('https://dead.example.com/b').allow()
+    assert breakers.get('https://live.example.com/a').allow()
+    assert list(breakers.summary()) == ['https://dead.example.com']
+
+def test_host_key_keeps_scheme_and_port():
+    assert host_key('http://Example.com:8080/x?y=1') == 'http://example.com:8080'
@@ -0,0 +1,52 @@
+import importlib.util
+import requests
+import pytest
+from code_exporter import CodeExporter
+from devtools_parser import AdvancedDevToolsParser
+
+def load_module(tmp_path, code):
+    path = tmp_path / 'api_client.py'
+    path.write_text(code, encoding='utf-8')
+    spec = importlib.util.spec_from_file_location('api_client', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_sdk_function_names_do_not_shadow_helpers(tmp_path):
+    apis = [
+        {'url': 'https://api.example.com/session', 'method': 'GET'},
+        {'url': 'https://api.example.com/request', 'method': 'GET'}
+    ]
+    module = load_module(tmp_path, CodeExporter().export_sdk_module(apis))
+    
+    assert 'get_session_2' in module.__all__
+    assert isinstance(module.get_session(), requests.Session)
+    assert callable(module.get_request)
+
+def test_sdk_multiline_literals_compile(tmp_path):
+    headers = {f'X-Header-{i}': 'value ' * 4 for i in range(6)}
+    apis = [
+        {'url': 'https://api.example.com/a', 'method': 'POST', 'headers': headers,
+         'json_body': {f'field_{i}': list(range(10)) for i in range(5)}},
+        {'url': 'https://api.example.com/b', 'method': 'GET', 'params': {f'p{i}': 'x' * 20 for i in range(6)}}
+    ]
+    module = load_module(tmp_path, CodeExporter().export_sdk_module(apis))
+    
+    assert module.__all__ == ['get_session', 'post_a', 'get_b']
+
+def test_async_client_rejects_concurrency_below_one():
+    with pytest.raises(ValueError):
+        CodeExporter().export_async_client([{'url': 'https://api.example.com/a'}], concurrency=0)
+
+def test_get_params_already_in_the_url_are_not_sent_twice():
+    captured = AdvancedDevToolsParser()._normalize_request(
+        {'url': 'https://a.example.com/v1/x', 'method': 'GET', 'params': {'q': 1}, 'headers': {}, 'cookies': {}}
+    )
+    exporter = CodeExporter()
+    
+    assert 'params' not in exporter._endpoint_spec(captured)
+    assert exporter.export_k6_script([{'api_info': captured, 'weight': 1}]).count('q=1') == 1
+    
+    # A HAR entry keeps the query out of the URL
+    har = {'url': 'https://a.example.com/v1/x', 'method': 'GET', 'params': {'q': 1}}
+    assert exporter._endpoint_spec(har)['params'] == {'q': '1'}
@@ -0,0 +1,86 @@
+from concurrency_limit import AIMDLimit, HostConcurrency
+
+def finish(limit, status=200, latency=0.02, endpoint='a', **extra):
+    started = limit.acquire()
+    result = {'status_code': status, 'response_time': latency, 'api_info': {'fingerprint': endpoint}}
+    result.update(extra)
+    limit.release(started, result)
+
+def test_grows_about_one_per_limit_of_responses_while_busy():
+    limit = AIMDLimit(initial=4, max_limit=6)
+    for _ in range(3):
+        limit.acquire()
+    for _ in range(40):
+        finish(limit)
+    
+    assert limit.snapshot()['limit'] == 6
+    assert limit.snapshot()['increases'] == 2
+
+def test_does_not_grow_while_idle():
+    limit = AIMDLimit(initial=8)
+    for _ in range(40):
+        finish(limit)
+    
+    assert limit.snapshot()['limit'] == 8
+
+def test_overload_statuses_and_connection_errors_cut():
+    limit = AIMDLimit(initial=8)
+    finish(limit, status=503)
+    assert limit.snapshot()['limit'] == 4
+    
+    finish(limit, status=0)
+    assert limit.snapshot()['limit'] == 2
+    assert limit.snapshot()['error_rate'] == 1.0
+
+def test_one_cut_per_window():
+    limit = AIMDLimit(initial=8)
+    first, second = limit.acquire(), limit.acquire()
+    limit.release(first, {'status_code': 429})
+    limit.release(second, {'status_code': 429})
+    
+    assert limit.snapshot()['limit'] == 4
+    assert limit.snapshot()['decreases'] == 1
+
+def test_never_below_min_limit():
+    limit = AIMDLimit(initial=2, min_limit=1)
+    for _ in range(5):
+        finish(limit, status=502)
+    
+    assert limit.snapshot()['limit'] == 1
+
+def test_slow_endpoints_on_a_healthy_host_do_not_cut():
+    limit = AIMDLimit(initial=4)
+    for i in range(10):
+        finish(limit, latency=0.02, endpoint=f'fast-{i}')
+    for i in range(10):
+        finish(limit, latency=0.4, endpoint=f'slow-{i}')
+    for i in range(10):
+        finish(limit, latency=0.02, endpoint=f'fast-{i}')
+        finish(limit, latency=0.4, endpoint='slow-0')
+    
+    assert limit.snapshot()['decreases'] == 0
+
+def test_sustained_rise_over_an_endpoints_baseline_cuts():
+    limit = AIMDLimit(initial=4, sustain=3)
+    for _ in range(10):
+        finish(limit, latency=0.02)
+    for _ in range(2):
+        finish(limit, latency=1.0)
+    assert limit.snapshot()['decreases'] == 0
+    
+    finish(limit, latency=1.0)
+    assert limit.snapshot()['limit'] == 2
+
+def test_skipped_results_are_ignored():
+    limit = AIMDLimit(initial=4)
+    finish(limit, status=0, skipped=True)
+    
+    assert limit.snapshot()['limit'] == 4
+    assert limit.in_flight == 0
+
+def test_limits_are_per_host():
+    limits = HostConcurrency(initial=4)
+    finish(limits.get('https://busy.example.com/a'), status=503)
+    
+    assert limits.get('https://busy.example.com/b').snapshot()['limit'] == 2
+    assert limits.get('https://calm.example.com/a').snapshot()['limit'] == 4
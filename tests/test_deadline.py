@@ -0,0 +1,31 @@
+import time
+from deadline import Deadline
+
+def test_no_budget_uses_the_request_timeout():
+    deadline = Deadline(None, request_timeout=15)
+    
+    assert deadline.timeout() == 15
+    assert deadline.remaining() is None
+    assert deadline.closing_in() is None
+    assert deadline.snapshot()['remaining'] is None
+
+def test_timeout_is_capped_by_what_is_left():
+    deadline = Deadline(10, request_timeout=15)
+    
+    assert 9 < deadline.timeout() <= 10
+    assert 4 < deadline.timeout(wait=5) <= 5
+    assert Deadline(100, request_timeout=15).timeout() == 15
+
+def test_nothing_starts_once_less_than_min_timeout_is_left():
+    deadline = Deadline(0.5, min_timeout=1.0)
+    
+    assert deadline.timeout() is None
+    assert deadline.closing_in() == 0
+    assert Deadline(10, min_timeout=1.0).timeout(wait=9.5) is None
+
+def test_remaining_counts_down():
+    deadline = Deadline(1, min_timeout=0.5)
+    time.sleep(0.05)
+    
+    assert deadline.remaining() <= 0.95
+    assert 0 < deadline.closing_in() <= 0.45
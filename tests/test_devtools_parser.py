@@ -0,0 +1,52 @@
+from devtools_parser import AdvancedDevToolsParser
+
+def make_request(**overrides):
+    request = {
+        'url': 'https://api.example.com/v1/items?b=2&a=1',
+        'method': 'GET',
+        'headers': {'Accept': 'application/json', 'X-Request-Id': 'abc'},
+        'cookies': {'session': 's1'},
+        'params': {}
+    }
+    request.update(overrides)
+    return request
+
+def test_fingerprint_ignores_volatile_headers_and_query_order():
+    parser = AdvancedDevToolsParser()
+    first = make_request()
+    second = make_request(
+        url='https://API.example.com/v1/items?a=1&b=2',
+        headers={'accept': ' application/json', 'X-Request-Id': 'xyz', 'sec-ch-ua': '"Chromium"'}
+    )
+    assert parser.fingerprint_request(first) == parser.fingerprint_request(second)
+
+def test_fingerprint_tells_methods_and_cookies_apart():
+    parser = AdvancedDevToolsParser()
+    base = parser.fingerprint_request(make_request())
+    assert parser.fingerprint_request(make_request(method='POST')) != base
+    assert parser.fingerprint_request(make_request(cookies={'session': 's2'})) != base
+
+def test_fingerprint_tells_bodies_apart():
+    parser = AdvancedDevToolsParser()
+    first = make_request(method='POST', json_body={'id': 1, 'page': 2})
+    reordered = make_request(method='POST', json_body={'page': 2, 'id': 1})
+    other = make_request(method='POST', json_body={'id': 2, 'page': 2})
+    form = make_request(method='POST', data='id=1')
+    
+    assert parser.fingerprint_request(first) == parser.fingerprint_request(reordered)
+    assert parser.fingerprint_request(first) != parser.fingerprint_request(other)
+    assert parser.fingerprint_request(first) != parser.fingerprint_request(form)
+
+def test_deduplicate_keeps_first_occurrence_in_capture_order():
+    parser = AdvancedDevToolsParser()
+    requests = [
+        make_request(),
+        make_request(url='https://api.example.com/v1/other'),
+        make_request(headers={'Accept': 'application/json', 'X-Request-Id': 'def'})
+    ]
+    
+    unique, groups = parser.deduplicate_requests(requests)
+    
+    assert unique == requests[:2]
+    assert groups[requests[0]['fingerprint']] == [requests[0], requests[2]]
+    assert requests[2]['fingerprint'] == requests[0]['fingerprint']
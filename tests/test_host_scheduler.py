@@ -0,0 +1,81 @@
+from collections import Counter
+from types import SimpleNamespace
+from concurrency_limit import HostConcurrency
+from host_scheduler import HostScheduler
+from rate_limit import HostRateLimiter
+
+SLOW = 'https://slow.example.com'
+FAST = 'https://fast.example.com'
+
+def api(host, i, **extra):
+    data = {'url': f'{host}/item/{i}', 'method': 'GET'}
+    data.update(extra)
+    return data
+
+def pop_all(scheduler):
+    order = []
+    while len(scheduler):
+        order.append(scheduler.pop_ready())
+    return order
+
+def test_hosts_get_equal_worker_time():
+    scheduler = HostScheduler(quantum=0.25)
+    scheduler.record(SLOW + '/x', 1.0)
+    scheduler.record(FAST + '/x', 0.1)
+    for i in range(20):
+        scheduler.push(api(SLOW, i))
+    for i in range(20):
+        scheduler.push(api(FAST, i))
+    
+    first = Counter(item['url'].split('/item')[0] for item in pop_all(scheduler)[:11])
+    
+    assert first[SLOW] == 1
+    assert first[FAST] == 10
+
+def test_record_smooths_the_expected_cost():
+    scheduler = HostScheduler(default_cost=0.1, smoothing=0.5)
+    assert scheduler.cost('https://new.example.com') == 0.1
+    
+    scheduler.record(SLOW + '/a', 1.0)
+    scheduler.record(SLOW + '/b', 3.0)
+    assert scheduler.cost('https://slow.example.com') == 2.0
+
+def test_critical_requests_go_first():
+    scheduler = HostScheduler()
+    for i in range(3):
+        scheduler.push(api(FAST, i))
+    scheduler.push(api(SLOW, 0, tags=['critical']))
+    
+    assert scheduler.pop_ready()['url'] == SLOW + '/item/0'
+
+def test_hosts_at_their_concurrency_limit_wait():
+    concurrency = HostConcurrency(initial=1)
+    scheduler = HostScheduler(concurrency=concurrency)
+    scheduler.push(api(SLOW, 0))
+    scheduler.push(api(SLOW, 1))
+    
+    concurrency.get(SLOW).acquire()
+    assert scheduler.pop_ready() is None
+    assert scheduler.next_ready_in() is None
+
+def test_rate_limited_hosts_report_their_wait():
+    limiter = HostRateLimiter()
+    limiter.update(SLOW, SimpleNamespace(status_code=429, headers={'Retry-After': '5'}))
+    scheduler = HostScheduler(rate_limiter=limiter)
+    scheduler.push(api(SLOW, 0))
+    
+    assert scheduler.pop_ready() is None
+    assert 4 < scheduler.next_ready_in() <= 5
+    
+    scheduler.push(api(FAST, 0))
+    assert scheduler.pop_ready()['url'] == FAST + '/item/0'
+
+def test_drain_empties_every_queue():
+    scheduler = HostScheduler()
+    queued = [api(SLOW, 0), api(FAST, 0), api(SLOW, 1)]
+    for item in queued:
+        scheduler.push(item)
+    
+    assert sorted(scheduler.drain(), key=lambda item: item['url']) == sorted(queued, key=lambda item: item['url'])
+    assert len(scheduler) == 0
+    assert scheduler.pop_ready() is None
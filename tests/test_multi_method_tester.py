@@ -0,0 +1,103 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from method_cache import MethodCache
+from multi_method_tester import MultiMethodTester
+
+# path -> (Allow header or None, methods answered with 200)
+ROUTES = {
+    '/get': (None, {'GET'}),
+    '/allow/post': ('GET, POST', {'POST'}),
+    '/allow/both': ('GET, POST', {'GET', 'POST'}),
+    '/allow/patch': ('GET, HEAD, OPTIONS, PATCH', {'PATCH'})
+}
+
+class Handler(BaseHTTPRequestHandler):
+    hits = []
+    
+    def _answer(self):
+        self.hits.append((self.command, self.path))
+        allow, working = ROUTES.get(self.path, (None, set()))
+        status = 200 if self.command in working else 405
+        body = b'{"ok": 1}' if status == 200 and self.command != 'HEAD' else b''
+        self.send_response(status)
+        if allow:
+            self.send_header('Allow', allow)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    do_GET = do_HEAD = do_OPTIONS = do_POST = do_PUT = do_DELETE = do_PATCH = _answer
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    Handler.hits = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def tester(tmp_path):
+    return MultiMethodTester(MethodCache(cache_file=str(tmp_path / 'method_cache.json')))
+
+def sent(path):
+    return [method for method, hit in Handler.hits if hit == path]
+
+def test_unsafe_methods_are_not_probed_without_allow(server, tester):
+    results = tester.discover_method(server + '/get')
+    
+    assert results['GET']['success']
+    assert set(sent('/get')) <= {'OPTIONS', 'HEAD', 'GET'}
+    assert results['POST'] == {'success': False, 'skipped': True}
+
+def test_allowed_unsafe_method_is_tried_after_safe_probes_fail(server, tester):
+    results = tester.discover_method(server + '/allow/post')
+    
+    assert results['GET']['status_code'] == 405
+    assert results['POST']['success']
+    methods = sent('/allow/post')
+    assert methods.index('GET') < methods.index('POST')
+    assert 'PUT' not in methods and 'DELETE' not in methods
+
+def test_discovery_covers_other_methods_the_server_allows(server, tester):
+    results = tester.discover_method(server + '/allow/patch')
+    
+    assert list(results) == ['GET', 'PATCH']
+    assert results['PATCH']['success']
+    assert 'POST' not in sent('/allow/patch')
+
+def test_allowed_unsafe_method_is_not_sent_once_a_safe_one_works(server, tester):
+    results = tester.discover_method(server + '/allow/both')
+    
+    assert results['GET']['success']
+    assert 'POST' not in sent('/allow/both')
+
+def test_test_all_methods_on_a_cache_miss(server, tester):
+    results = tester.test_all_methods(server + '/get')
+    
+    assert list(results) == ['GET']
+    assert results['GET']['success']
+    assert tester.method_cache.get(server + '/get') == 'GET'
+
+def test_cached_method_is_sent_alone(server, tester):
+    tester.discover_method(server + '/allow/post')
+    Handler.hits = []
+    
+    results = tester.discover_method(server + '/allow/post')
+    
+    assert results['POST']['cached']
+    assert sent('/allow/post') == ['POST']
+
+def test_stale_cached_method_is_rediscovered(server, tester):
+    tester.method_cache.put(server + '/get', 'DELETE')
+    
+    results = tester.discover_method(server + '/get')
+    
+    assert results['GET']['success']
+    assert tester.method_cache.get(server + '/get') == 'GET'
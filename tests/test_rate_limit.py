@@ -0,0 +1,60 @@
+import time
+from types import SimpleNamespace
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from rate_limit import TokenBucket, HostRateLimiter, parse_retry_after, parse_reset
+
+URL = 'https://api.example.com/items'
+
+def response(status=200, **headers):
+    return SimpleNamespace(status_code=status, headers={k.replace('_', '-'): v for k, v in headers.items()})
+
+def test_token_bucket_takes_until_empty_then_reports_the_wait():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    wait = bucket.try_take()
+    assert 0 < wait <= 0.1
+    assert bucket.wait_time() > 0
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after('5') == 5
+    assert parse_retry_after('-3') == 0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 < parse_retry_after(later) <= 60
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+def test_parse_reset_accepts_deltas_and_epoch_timestamps():
+    assert parse_reset('30') == 30
+    assert 25 < parse_reset(str(time.time() + 30)) <= 30
+    assert parse_reset('never') is None
+
+def test_429_pauses_only_its_host():
+    limiter = HostRateLimiter()
+    limiter.update(URL, response(429, Retry_After='2'))
+    
+    assert 1.5 < limiter.delay(URL) <= 2
+    assert limiter.delay('https://other.example.com/') == 0
+    assert limiter.summary()['https://api.example.com']['pauses'] == 1
+
+def test_429_without_retry_after_uses_the_default_pause():
+    limiter = HostRateLimiter(default_pause=0.5)
+    limiter.update(URL, response(429))
+    
+    assert 0 < limiter.delay(URL) <= 0.5
+
+def test_exhausted_quota_pauses_until_reset():
+    limiter = HostRateLimiter(max_pause=10)
+    limiter.update(URL, response(X_RateLimit_Remaining='0', X_RateLimit_Reset='60', X_RateLimit_Limit='100'))
+    
+    assert 9 < limiter.delay(URL) <= 10
+
+def test_remaining_quota_is_spent_through_a_token_bucket():
+    limiter = HostRateLimiter()
+    limiter.update(URL, response(RateLimit_Remaining='2', RateLimit_Reset='100', RateLimit_Limit='10, 10;w=100'))
+    
+    limiter.acquire(URL)
+    limiter.acquire(URL)
+    assert limiter.delay(URL) > 0
+    assert limiter.summary()['https://api.example.com']['limit'] == 10
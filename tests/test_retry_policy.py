@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+import requests
+import pytest
+from retry_policy import RetryBudget, RetryPolicy
+
+def response(status):
+    return SimpleNamespace(status_code=status)
+
+@pytest.fixture(scope='module')
+def refused():
+    """A real connection error: nothing listens on port 1"""
+    try:
+        requests.get('http://127.0.0.1:1/', timeout=2)
+    except requests.ConnectionError as e:
+        return e
+    pytest.skip('port 1 accepted a connection')
+
+def test_budget_allows_min_retries_then_a_ratio_of_requests():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.snapshot() == {'requests': 4, 'retries': 3, 'denied': 2}
+
+def test_idempotent_methods_retry_transient_statuses():
+    policy = RetryPolicy()
+    assert policy.is_retryable('GET', response(503))
+    assert policy.is_retryable('PUT', response(502))
+    assert not policy.is_retryable('GET', response(500))
+    assert not policy.is_retryable('GET', response(404))
+
+def test_post_retries_only_when_the_server_cannot_have_acted(refused):
+    policy = RetryPolicy()
+    assert policy.is_retryable('POST', response(429))
+    assert policy.is_retryable('POST', response(503))
+    assert not policy.is_retryable('POST', response(502))
+    assert not policy.is_retryable('POST', error=requests.ReadTimeout())
+    assert policy.is_retryable('POST', error=refused)
+    assert RetryPolicy(retry_non_idempotent=True).is_retryable('POST', response(502))
+
+def test_should_retry_respects_attempts_and_budget():
+    policy = RetryPolicy(max_attempts=3, budget=RetryBudget(ratio=0, min_retries=1))
+    assert policy.should_retry('GET', 0, response(503))
+    assert not policy.should_retry('GET', 1, response(503))
+    assert policy.budget.denied == 1
+    
+    assert not RetryPolicy(max_attempts=2).should_retry('GET', 1, response(503))
+
+def test_backoff_stays_under_the_cap():
+    policy = RetryPolicy(base_delay=0.5, max_delay=2)
+    assert all(0 <= policy.backoff(attempt) <= 2 for attempt in range(10) for _ in range(20))
@@ -0,0 +1,62 @@
+import csv
+import json
+from run_history import LatencyHistory
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    return str(path)
+
+def test_load_reads_jsonl_and_csv(tmp_path):
+    jsonl = write_jsonl(tmp_path / 'run.jsonl', [
+        {'url': 'https://x/a', 'method': 'GET', 'response_time': 0.2, 'fingerprint': 'fa'},
+        {'url': 'https://x/b', 'method': 'GET', 'response_time': 0, 'fingerprint': 'fb'},
+        {'url': 'https://x/c', 'method': 'GET', 'response_time': 9, 'skipped': True}
+    ])
+    with open(tmp_path / 'run.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, ['url', 'method', 'response_time', 'deduplicated'])
+        writer.writeheader()
+        writer.writerow({'url': 'https://x/d', 'method': 'POST', 'response_time': '1.5', 'deduplicated': 'False'})
+        writer.writerow({'url': 'https://x/e', 'method': 'GET', 'response_time': '3', 'deduplicated': 'True'})
+    
+    history = LatencyHistory()
+    assert history.load(jsonl) == 3
+    assert history.load(str(tmp_path / 'run.csv')) == 2
+    
+    assert history.expected({'url': 'https://x/a', 'fingerprint': 'fa'}) == 0.2
+    assert history.expected({'url': 'https://x/a', 'method': 'GET'}) == 0.2
+    assert history.expected({'url': 'https://x/d', 'method': 'POST'}) == 1.5
+    assert history.expected({'url': 'https://x/b'}) is None
+    assert history.expected({'url': 'https://x/c'}) is None
+    assert history.expected({'url': 'https://x/e'}) is None
+
+def test_expected_is_the_median_of_recent_runs():
+    history = LatencyHistory(max_samples=3)
+    for seconds in [10, 1, 2, 3]:
+        history.add({'url': 'https://x/a', 'response_time': seconds})
+    
+    assert history.expected({'url': 'https://x/a'}) == 2
+
+def test_plan_puts_critical_then_longest_first():
+    history = LatencyHistory()
+    for name, seconds in [('a', 1), ('b', 4), ('c', 2)]:
+        history.add({'url': f'https://x/{name}', 'response_time': seconds})
+    apis = [
+        {'url': 'https://x/a'},
+        {'url': 'https://x/b'},
+        {'url': 'https://x/c'},
+        {'url': 'https://x/new', 'tags': ['critical']}
+    ]
+    
+    ordered, schedule = history.plan(apis, workers=2)
+    
+    assert [api['url'] for api in ordered] == ['https://x/new', 'https://x/b', 'https://x/c', 'https://x/a']
+    # new counts at the median (2 s); new + c fill one worker, b the other, then a
+    assert schedule == {'predicted': 5, 'known': 3, 'critical': 1}
+
+def test_plan_without_history_keeps_capture_order():
+    apis = [{'url': 'https://x/a'}, {'url': 'https://x/b'}]
+    
+    ordered, schedule = LatencyHistory().plan(apis, workers=4)
+    
+    assert ordered == apis
+    assert schedule['predicted'] is None
@@ -0,0 +1,41 @@
+import os
+import stat
+from advanced_login import UniversalLoginSystem
+from session_pool import SessionPool
+
+def login_system(tmp_path):
+    pool = SessionPool(str(tmp_path / 'sessions.json'))
+    return UniversalLoginSystem(pool, layout_cache_file=str(tmp_path / 'login_layouts.json'))
+
+def test_pool_file_is_owner_only(tmp_path):
+    pool = SessionPool(str(tmp_path / 'sessions.json'))
+    pool.put('https://a.example.com/login', 'user', cookies={'sid': 'x'})
+    
+    assert stat.S_IMODE(os.stat(pool.pool_file).st_mode) == 0o600
+    assert SessionPool(pool.pool_file).get('https://a.example.com/login', 'user')['cookies'] == {'sid': 'x'}
+
+def test_expired_sessions_are_dropped(tmp_path):
+    pool = SessionPool(str(tmp_path / 'sessions.json'))
+    pool.put('https://a.example.com/login', 'user', cookies={'sid': 'x'}, ttl=-1)
+    
+    assert pool.get('https://a.example.com/login', 'user') is None
+
+def test_relative_login_urls_are_pooled_per_site(tmp_path):
+    system = login_system(tmp_path)
+    system.session_pool.put('https://a.example.com/login', 'user', cookies={'sid': 'a'})
+    
+    reused = system.get_session('/login', 'user', 'secret', base_url='https://a.example.com')
+    assert reused.get('reused') and reused['cookies'] == {'sid': 'a'}
+    
+    # Nothing listens on port 1, so a login attempt fails fast instead of reusing site a's session
+    other = login_system(tmp_path).get_session('/login', 'user', 'secret', base_url='http://127.0.0.1:1')
+    assert not other['success']
+
+def test_relogin_drops_the_resolved_entry(tmp_path):
+    system = login_system(tmp_path)
+    system.session_pool.put('http://127.0.0.1:1/login', 'user', cookies={'sid': 'stale'})
+    
+    result = system.relogin('/login', 'user', 'secret', base_url='http://127.0.0.1:1')
+    
+    assert not result['success']
+    assert system.session_pool.get('http://127.0.0.1:1/login', 'user') is None